@@ -6,12 +6,12 @@
 
 import json
 import asyncio
-from typing import Dict, Any, AsyncGenerator
+from typing import Dict, Any, AsyncGenerator, List
 from datetime import datetime, timedelta
 from loguru import logger
 
 from .base_agent import BaseAgent, AgentResult, SystemDiagnosticTool
-from ..models import SystemSnapshot
+from ..models import SystemSnapshot, ProcessTable
 
 
 class SystemAnalysisAgent(BaseAgent):
@@ -231,7 +231,7 @@ class SystemAnalysisAgent(BaseAgent):
             process_analysis = await self._call_process_analysis_tool([p.dict() for p in system_data.processes])
             
             # 分析系统负载
-            load_analysis = self._analyze_system_load(system_data.processes, system_data.system_info)
+            load_analysis = self._analyze_system_load(system_data.process_table, system_data.system_info)
             
             # 生成系统建议
             recommendations = self._generate_system_recommendations(
@@ -358,12 +358,12 @@ class SystemAnalysisAgent(BaseAgent):
         
         return analysis
     
-    def _analyze_system_load(self, processes, system_info) -> str:
+    def _analyze_system_load(self, processes: ProcessTable, system_info: Dict[str, Any]) -> str:
         """分析系统负载"""
         try:
             # 计算总体资源使用
-            total_cpu = sum(p.cpu_percent for p in processes)
-            total_memory = sum(p.memory_percent for p in processes)
+            total_cpu = float(processes.cpu_percent.sum())
+            total_memory = float(processes.memory_percent.sum())
             
             analysis = []
             
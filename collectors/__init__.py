@@ -6,8 +6,9 @@
 
 import asyncio
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional, AsyncGenerator, Dict, Any
+from typing import Optional, AsyncGenerator, Dict, Any, Callable, List
 from loguru import logger
 
 from .hardware_collector import HardwareCollector
@@ -20,6 +21,9 @@ from core.config_models import CollectorConfiguration
 class DataCollectionManager:
     """数据收集管理器"""
     
+    # 收集槽位名称到日志显示名称的映射
+    _COLLECTOR_NAMES = {"hardware": "硬件", "system": "系统", "network": "网络"}
+    
     def __init__(self, config: CollectorConfiguration):
         """
         初始化数据收集管理器
@@ -32,13 +36,19 @@ class DataCollectionManager:
         self.system_collector = SystemCollector(max_processes=config.max_processes)
         self.network_collector = NetworkCollector(timeout=config.network_timeout)
         
+        # 常驻执行器，每个子收集器一个线程，在所有快照之间复用
+        self._executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="sysgraph-collector")
+        
         self._collection_running = False
         self._last_collection_time: Optional[datetime] = None
     
-    async def collect_single_snapshot(self) -> SystemSnapshot:
+    async def collect_single_snapshot(self, progress_callback: Optional[Callable[[List[str]], None]] = None) -> SystemSnapshot:
         """
         收集单次系统快照
         
+        Args:
+            progress_callback: 进度回调函数，启动收集前以全部阶段消息列表调用一次
+            
         Returns:
             SystemSnapshot: 系统快照数据
         """
@@ -46,47 +56,39 @@ class DataCollectionManager:
             collection_id = str(uuid.uuid4())
             logger.info(f"开始收集系统快照: {collection_id}")
             
-            # 并行收集各类数据
-            tasks = []
+            # 并行收集各类数据，按名称记录每个收集槽位
+            tasks = {}
+            stages = []
             
             if self.config.enable_hardware_monitoring:
-                tasks.append(self._collect_hardware_async())
+                stages.append("正在检测硬件设备...")
+                tasks["hardware"] = self._collect_hardware_async()
             
             if self.config.enable_system_monitoring:
-                tasks.append(self._collect_system_async())
+                stages.append("正在收集系统信息...")
+                tasks["system"] = self._collect_system_async()
             
             if self.config.enable_network_monitoring:
-                tasks.append(self._collect_network_async())
+                stages.append("正在检查网络连接...")
+                tasks["network"] = self._collect_network_async()
             
-            # 等待所有收集任务完成
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            # 各阶段并行执行，进度消息合并为一次回调
+            self._report_progress(progress_callback, stages)
             
-            # 处理结果
-            hardware_data = None
-            system_data = None
-            network_data = None
-            
-            task_index = 0
-            if self.config.enable_hardware_monitoring:
-                if isinstance(results[task_index], Exception):
-                    logger.error(f"硬件数据收集失败: {results[task_index]}")
-                else:
-                    hardware_data = results[task_index]
-                task_index += 1
+            # 等待所有收集任务完成，单个收集器失败不影响其他槽位
+            results = await asyncio.gather(*tasks.values(), return_exceptions=True)
             
-            if self.config.enable_system_monitoring:
-                if isinstance(results[task_index], Exception):
-                    logger.error(f"系统数据收集失败: {results[task_index]}")
+            # 处理结果
+            collected = {}
+            for name, result in zip(tasks, results):
+                if isinstance(result, Exception):
+                    logger.error(f"{self._COLLECTOR_NAMES[name]}数据收集失败: {result}")
                 else:
-                    system_data = results[task_index]
-                task_index += 1
+                    collected[name] = result
             
-            if self.config.enable_network_monitoring:
-                if isinstance(results[task_index], Exception):
-                    logger.error(f"网络数据收集失败: {results[task_index]}")
-                else:
-                    network_data = results[task_index]
-                task_index += 1
+            hardware_data = collected.get("hardware")
+            system_data = collected.get("system")
+            network_data = collected.get("network")
             
             # 创建系统快照
             snapshot = SystemSnapshot(
@@ -106,20 +108,28 @@ class DataCollectionManager:
             logger.error(f"收集系统快照失败: {e}")
             raise
     
+    def _report_progress(self, progress_callback: Optional[Callable[[List[str]], None]], stages: List[str]) -> None:
+        """报告收集进度"""
+        if progress_callback and stages:
+            try:
+                progress_callback(stages)
+            except Exception as e:
+                logger.warning(f"进度回调失败: {e}")
+    
     async def _collect_hardware_async(self) -> HardwareData:
         """异步收集硬件数据"""
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self.hardware_collector.collect_hardware_data)
+        return await loop.run_in_executor(self._executor, self.hardware_collector.collect_hardware_data)
     
     async def _collect_system_async(self) -> SystemData:
         """异步收集系统数据"""
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self.system_collector.collect_system_data)
+        return await loop.run_in_executor(self._executor, self.system_collector.collect_system_data)
     
     async def _collect_network_async(self) -> NetworkData:
         """异步收集网络数据"""
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, 
+        return await loop.run_in_executor(self._executor, 
                                         self.network_collector.collect_network_data, 
                                         self.config.ping_hosts)
     
@@ -190,6 +200,11 @@ class DataCollectionManager:
         self._collection_running = False
         logger.info("已请求停止数据收集")
     
+    def shutdown(self) -> None:
+        """关闭收集执行器"""
+        self._collection_running = False
+        self._executor.shutdown(wait=False)
+    
     def is_collecting(self) -> bool:
         """检查是否正在收集"""
         return self._collection_running
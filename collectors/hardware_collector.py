@@ -7,7 +7,7 @@
 import psutil
 import platform
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from loguru import logger
 
 from models import CPUInfo, MemoryInfo, DiskInfo, HardwareData
@@ -19,6 +19,8 @@ class HardwareCollector:
     def __init__(self):
         """初始化硬件收集器"""
         self._last_cpu_times = None
+        # 按 (设备, 挂载点) 缓存上次构建的磁盘模型，跨刷新复用
+        self._disk_cache: Dict[Tuple[str, str], DiskInfo] = {}
         
     def collect_cpu_info(self) -> CPUInfo:
         """
@@ -120,6 +122,7 @@ class HardwareCollector:
             List[DiskInfo]: 磁盘信息列表
         """
         disks = []
+        disk_cache: Dict[Tuple[str, str], DiskInfo] = {}
         
         try:
             # 获取所有磁盘分区
@@ -130,22 +133,34 @@ class HardwareCollector:
                     # 获取分区使用情况
                     usage = psutil.disk_usage(partition.mountpoint)
                     
-                    disk_info = DiskInfo(
-                        device=partition.device,
-                        mountpoint=partition.mountpoint,
-                        filesystem=partition.fstype,
-                        total=usage.total,
-                        used=usage.used,
-                        free=usage.free,
-                        usage_percent=(usage.used / usage.total) * 100 if usage.total > 0 else 0.0
-                    )
+                    fields = {
+                        "filesystem": partition.fstype,
+                        "total": usage.total,
+                        "used": usage.used,
+                        "free": usage.free,
+                        "usage_percent": (usage.used / usage.total) * 100 if usage.total > 0 else 0.0,
+                    }
                     
+                    # 已知分区：未变化时直接复用，仅用量变化时跳过校验复制更新
+                    key = (partition.device, partition.mountpoint)
+                    cached = self._disk_cache.get(key)
+                    if cached is None:
+                        disk_info = DiskInfo(device=partition.device, mountpoint=partition.mountpoint, **fields)
+                    elif all(getattr(cached, name) == value for name, value in fields.items()):
+                        disk_info = cached
+                    else:
+                        disk_info = cached.model_copy(update=fields)
+                    
+                    disk_cache[key] = disk_info
                     disks.append(disk_info)
                     
                 except (PermissionError, OSError) as e:
                     logger.warning(f"无法访问分区 {partition.device}: {e}")
                     continue
-                    
+            
+            # 只保留本次仍存在的分区
+            self._disk_cache = disk_cache
+            
         except Exception as e:
             logger.error(f"收集磁盘信息失败: {e}")
         
@@ -8,7 +8,8 @@ import psutil
 import socket
 import subprocess
 import time
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from loguru import logger
 
@@ -32,6 +33,9 @@ from models import NetworkInterface, NetworkConnectivity, NetworkData
 class NetworkCollector:
     """网络信息收集器"""
     
+    # 并发连通性探测的最大线程数
+    MAX_CONCURRENT_PROBES = 16
+    
     def __init__(self, timeout: int = 10):
         """
         初始化网络收集器
@@ -40,6 +44,8 @@ class NetworkCollector:
             timeout: 网络超时时间(秒)
         """
         self.timeout = timeout
+        # 按 (接口名, MAC地址) 缓存上次构建的接口模型，跨刷新复用
+        self._iface_cache: Dict[Tuple[str, str], NetworkInterface] = {}
         
     def collect_network_interfaces(self) -> List[NetworkInterface]:
         """
@@ -49,6 +55,7 @@ class NetworkCollector:
             List[NetworkInterface]: 网络接口列表
         """
         interfaces = []
+        iface_cache: Dict[Tuple[str, str], NetworkInterface] = {}
         
         try:
             # 获取网络接口统计信息
@@ -85,24 +92,36 @@ class NetworkCollector:
                     packets_sent = io_counters.packets_sent if io_counters else 0
                     packets_recv = io_counters.packets_recv if io_counters else 0
                     
-                    interface_info = NetworkInterface(
-                        name=interface_name,
-                        ip_address=ip_address,
-                        mac_address=mac_address,
-                        is_up=is_up,
-                        speed=speed,
-                        bytes_sent=bytes_sent,
-                        bytes_recv=bytes_recv,
-                        packets_sent=packets_sent,
-                        packets_recv=packets_recv
-                    )
+                    fields = {
+                        "ip_address": ip_address,
+                        "is_up": is_up,
+                        "speed": speed,
+                        "bytes_sent": bytes_sent,
+                        "bytes_recv": bytes_recv,
+                        "packets_sent": packets_sent,
+                        "packets_recv": packets_recv,
+                    }
+                    
+                    # 已知接口：未变化时直接复用，仅计数变化时跳过校验复制更新
+                    key = (interface_name, mac_address)
+                    cached = self._iface_cache.get(key)
+                    if cached is None:
+                        interface_info = NetworkInterface(name=interface_name, mac_address=mac_address, **fields)
+                    elif all(getattr(cached, name) == value for name, value in fields.items()):
+                        interface_info = cached
+                    else:
+                        interface_info = cached.model_copy(update=fields)
                     
+                    iface_cache[key] = interface_info
                     interfaces.append(interface_info)
                     
                 except Exception as e:
                     logger.warning(f"获取接口 {interface_name} 信息失败: {e}")
                     continue
-                    
+            
+            # 只保留本次仍存在的接口
+            self._iface_cache = iface_cache
+            
         except Exception as e:
             logger.error(f"收集网络接口信息失败: {e}")
         
@@ -118,40 +137,47 @@ class NetworkCollector:
         Returns:
             List[NetworkConnectivity]: 连通性测试结果
         """
-        connectivity_results = []
+        if not hosts:
+            return []
         
-        for host in hosts:
-            try:
-                logger.debug(f"测试连通性: {host}")
-                
-                if HAS_PING3:
-                    # 使用ping3库
-                    latency = self._ping_with_ping3(host)
-                else:
-                    # 使用系统ping命令
-                    latency = self._ping_with_system(host)
-                
-                is_reachable = latency is not None
-                
-                connectivity = NetworkConnectivity(
-                    host=host,
-                    is_reachable=is_reachable,
-                    latency=latency,
-                    packet_loss=0.0 if is_reachable else 100.0
-                )
-                
-                connectivity_results.append(connectivity)
-                
-            except Exception as e:
-                logger.warning(f"测试主机 {host} 连通性失败: {e}")
-                connectivity_results.append(NetworkConnectivity(
-                    host=host,
-                    is_reachable=False,
-                    latency=None,
-                    packet_loss=100.0
-                ))
-        
-        return connectivity_results
+        # 各主机探测互不依赖，并发执行，总耗时取决于最慢的主机
+        with self._create_probe_executor(hosts) as executor:
+            return list(executor.map(self._test_host_connectivity, hosts))
+    
+    def _create_probe_executor(self, hosts: List[str]) -> ThreadPoolExecutor:
+        """创建连通性探测线程池，线程数不超过主机数和并发上限"""
+        return ThreadPoolExecutor(max_workers=max(1, min(len(hosts), self.MAX_CONCURRENT_PROBES)),
+                                  thread_name_prefix="sysgraph-ping")
+    
+    def _test_host_connectivity(self, host: str) -> NetworkConnectivity:
+        """测试单个主机的连通性"""
+        try:
+            logger.debug("测试连通性: {}", host)
+            
+            if HAS_PING3:
+                # 使用ping3库
+                latency = self._ping_with_ping3(host)
+            else:
+                # 使用系统ping命令
+                latency = self._ping_with_system(host)
+            
+            is_reachable = latency is not None
+            
+            return NetworkConnectivity(
+                host=host,
+                is_reachable=is_reachable,
+                latency=latency,
+                packet_loss=0.0 if is_reachable else 100.0
+            )
+            
+        except Exception as e:
+            logger.warning(f"测试主机 {host} 连通性失败: {e}")
+            return NetworkConnectivity(
+                host=host,
+                is_reachable=False,
+                latency=None,
+                packet_loss=100.0
+            )
     
     def _ping_with_ping3(self, host: str) -> Optional[float]:
         """使用ping3库进行ping测试"""
@@ -274,8 +300,11 @@ class NetworkCollector:
         try:
             logger.debug("开始收集网络数据")
             
-            interfaces = self.collect_network_interfaces()
-            connectivity = self.test_connectivity(ping_hosts)
+            # 先提交连通性探测，探测进行期间在当前线程枚举网络接口
+            with self._create_probe_executor(ping_hosts) as executor:
+                probes = executor.map(self._test_host_connectivity, ping_hosts)
+                interfaces = self.collect_network_interfaces()
+                connectivity = list(probes)
             
             network_data = NetworkData(
                 interfaces=interfaces,
@@ -283,7 +312,7 @@ class NetworkCollector:
                 timestamp=datetime.now()
             )
             
-            logger.debug(f"网络数据收集完成，包含 {len(interfaces)} 个接口，{len(connectivity)} 个连通性测试")
+            logger.debug("网络数据收集完成，包含 {} 个接口，{} 个连通性测试", len(interfaces), len(connectivity))
             return network_data
             
         except Exception as e:
@@ -7,11 +7,12 @@
 import psutil
 import platform
 import socket
+import numpy as np
 from datetime import datetime
 from typing import List, Optional
 from loguru import logger
 
-from models import SystemInfo, ProcessInfo, SystemData
+from models import SystemInfo, ProcessInfo, ProcessTable, SystemData
 
 
 class SystemCollector:
@@ -101,9 +102,8 @@ class SystemCollector:
                     if memory_percent is None:
                         memory_percent = 0.0
                     
-                    # 创建时间
-                    create_timestamp = proc_info.get('create_time', 0)
-                    create_time = datetime.fromtimestamp(create_timestamp)
+                    # 创建时间（直接保留Unix时间戳）
+                    create_time = proc_info.get('create_time') or 0.0
                     
                     # 命令行
                     cmdline = proc_info.get('cmdline')
@@ -156,7 +156,7 @@ class SystemCollector:
                 timestamp=datetime.now()
             )
             
-            logger.debug(f"系统数据收集完成，包含 {len(processes)} 个进程")
+            logger.debug("系统数据收集完成，包含 {} 个进程", len(processes))
             return system_data
             
         except Exception as e:
@@ -175,8 +175,8 @@ class SystemCollector:
         """
         try:
             processes = self.collect_processes_info()
-            processes.sort(key=lambda x: x.cpu_percent, reverse=True)
-            return processes[:count]
+            table = ProcessTable.from_processes(processes)
+            return [processes[i] for i in table.top_indices(table.cpu_percent, count)]
         except Exception as e:
             logger.error(f"获取CPU高使用率进程失败: {e}")
             return []
@@ -193,8 +193,8 @@ class SystemCollector:
         """
         try:
             processes = self.collect_processes_info()
-            processes.sort(key=lambda x: x.memory_percent, reverse=True)
-            return processes[:count]
+            table = ProcessTable.from_processes(processes)
+            return [processes[i] for i in table.top_indices(table.memory_percent, count)]
         except Exception as e:
             logger.error(f"获取内存高使用率进程失败: {e}")
             return []
@@ -209,13 +209,15 @@ class SystemCollector:
         try:
             system_data = self.collect_system_data()
             
-            # 计算进程统计
-            total_processes = len(system_data.processes)
-            running_processes = len([p for p in system_data.processes if p.status == 'running'])
+            # 计算进程统计（基于列存视图向量化计算）
+            table = system_data.process_table
+            total_processes = len(table)
+            running_processes = int(np.count_nonzero(table.statuses == 'running'))
             
             # CPU和内存使用率最高的进程
-            top_cpu_process = max(system_data.processes, key=lambda x: x.cpu_percent, default=None)
-            top_memory_process = max(system_data.processes, key=lambda x: x.memory_percent, default=None)
+            processes = system_data.processes
+            top_cpu_process = processes[int(table.cpu_percent.argmax())] if total_processes else None
+            top_memory_process = processes[int(table.memory_percent.argmax())] if total_processes else None
             
             return {
                 "hostname": system_data.system_info.hostname,
@@ -14,6 +14,7 @@ from .config_models import (
     LoggingConfiguration,
     RuleEngineConfiguration,
     SecurityConfiguration,
+    SECTION_CLASSES,
     DEFAULT_CONFIG,
 )
 
@@ -47,6 +48,7 @@ __all__ = [
     "LoggingConfiguration",
     "RuleEngineConfiguration",
     "SecurityConfiguration",
+    "SECTION_CLASSES",
     "DEFAULT_CONFIG",
     "ConfigurationManager",
     
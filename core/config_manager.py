@@ -4,14 +4,60 @@
 负责配置的加载、保存、验证和动态更新。
 """
 
+import os
 import json
+import functools
 import yaml
 import toml
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, List, Optional, Union
 from pathlib import Path
 from loguru import logger
+from pydantic import BaseModel
 
-from .config_models import ApplicationConfiguration, DEFAULT_CONFIG
+try:
+    import msgpack
+    HAS_MSGPACK = True
+except ImportError:
+    HAS_MSGPACK = False
+
+from .config_models import ApplicationConfiguration, SECTION_CLASSES, DEFAULT_CONFIG
+
+# 优先使用libyaml的C实现，未安装时回退到纯Python实现
+_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+@functools.lru_cache(maxsize=1)
+def _default_config_path() -> Path:
+    """获取默认配置文件路径（进程内只创建一次目录）"""
+    config_dir = Path.home() / ".sysgraph"
+    config_dir.mkdir(parents=True, exist_ok=True)
+    return config_dir / "config.yaml"
+
+
+def _read_bytes(path: Union[str, Path]) -> bytes:
+    """按fstat得到的大小直接读取整个文件，避免缓冲文件对象的额外系统调用"""
+    fd = os.open(path, os.O_RDONLY | getattr(os, 'O_CLOEXEC', 0) | getattr(os, 'O_BINARY', 0))
+    try:
+        # 通常一次read即可读完；POSIX允许短读（如网络文件系统、被信号中断），
+        # 文件也可能在读取期间增长，因此循环读到EOF
+        read_size = max(os.fstat(fd).st_size + 1, 65536)
+        chunks = []
+        while chunk := os.read(fd, read_size):
+            chunks.append(chunk)
+        return b''.join(chunks)
+    finally:
+        os.close(fd)
+
+
+def _construct_trusted_config(data: Dict[str, Any]) -> ApplicationConfiguration:
+    """从可信数据构建配置，跳过Pydantic校验"""
+    for name, field in ApplicationConfiguration.model_fields.items():
+        value = data.get(name)
+        section_class = field.annotation
+        if isinstance(value, dict) and isinstance(section_class, type) and issubclass(section_class, BaseModel):
+            data[name] = section_class.model_construct(**value)
+    return ApplicationConfiguration.model_construct(**data)
 
 
 class ConfigurationManager:
@@ -32,24 +78,25 @@ class ConfigurationManager:
         if config_file:
             self._config_file = Path(config_file)
         else:
-            self._config_file = self._get_default_config_path()
-        
-        # 创建必要目录
-        self._config.create_directories()
+            self._config_file = _default_config_path()
         
         # 加载配置
         self.load_config()
+        
+        # 按加载后的配置创建必要目录
+        self._config.create_directories()
     
     def _get_default_config_path(self) -> Path:
         """获取默认配置文件路径"""
-        config_dir = Path.home() / ".sysgraph"
-        config_dir.mkdir(parents=True, exist_ok=True)
-        return config_dir / "config.yaml"
+        return _default_config_path()
     
-    def load_config(self) -> bool:
+    def load_config(self, use_snapshot: bool = True) -> bool:
         """
         加载配置文件
         
+        Args:
+            use_snapshot: 是否允许使用与配置文件匹配的msgpack快照
+            
         Returns:
             bool: 加载是否成功
         """
@@ -59,19 +106,27 @@ class ConfigurationManager:
                 self.save_config()
                 return True
             
+            # 快照记录的源文件状态与当前配置文件一致时直接使用快照
+            snapshot_config = self._load_snapshot() if use_snapshot else None
+            if snapshot_config is not None:
+                self._config = snapshot_config
+                logger.info(f"配置快照加载成功: {self._config_file}")
+                self._notify_watchers('config_loaded', self._config)
+                return True
+            
             # 根据文件扩展名选择解析器
             file_extension = self._config_file.suffix.lower()
             
-            with open(self._config_file, 'r', encoding='utf-8') as f:
-                if file_extension == '.yaml' or file_extension == '.yml':
-                    config_data = yaml.safe_load(f)
-                elif file_extension == '.json':
-                    config_data = json.load(f)
-                elif file_extension == '.toml':
-                    config_data = toml.load(f)
-                else:
-                    logger.error(f"不支持的配置文件格式: {file_extension}")
-                    return False
+            # 一次读入原始字节，由解析器自行解码
+            if file_extension == '.yaml' or file_extension == '.yml':
+                config_data = yaml.load(_read_bytes(self._config_file), Loader=_LOADER)
+            elif file_extension == '.json':
+                config_data = json.loads(_read_bytes(self._config_file))
+            elif file_extension == '.toml':
+                config_data = toml.loads(_read_bytes(self._config_file).decode('utf-8'))
+            else:
+                logger.error(f"不支持的配置文件格式: {file_extension}")
+                return False
             
             # 验证和更新配置
             self._config = ApplicationConfiguration(**config_data)
@@ -107,7 +162,7 @@ class ConfigurationManager:
             
             with open(self._config_file, 'w', encoding='utf-8') as f:
                 if file_extension == '.yaml' or file_extension == '.yml':
-                    yaml.dump(config_dict, f, default_flow_style=False, 
+                    yaml.dump(config_dict, f, Dumper=_DUMPER, default_flow_style=False, 
                              allow_unicode=True, indent=2)
                 elif file_extension == '.json':
                     json.dump(config_dict, f, indent=2, ensure_ascii=False)
@@ -117,6 +172,9 @@ class ConfigurationManager:
                     logger.error(f"不支持的配置文件格式: {file_extension}")
                     return False
             
+            # 写入二进制快照以加速下次加载
+            self._save_snapshot(config_dict)
+            
             logger.info(f"配置文件保存成功: {self._config_file}")
             
             # 触发配置保存事件
@@ -128,6 +186,54 @@ class ConfigurationManager:
             logger.error(f"保存配置文件失败: {e}")
             return False
     
+    def _get_snapshot_path(self) -> Path:
+        """获取msgpack快照路径"""
+        return self._config_file.with_suffix(self._config_file.suffix + '.msgpack')
+    
+    def _load_snapshot(self) -> Optional[ApplicationConfiguration]:
+        """
+        加载msgpack配置快照
+        
+        Returns:
+            快照记录的源文件 (mtime_ns, size) 与当前配置文件完全一致时返回配置对象，否则返回None
+        """
+        if not HAS_MSGPACK:
+            return None
+        
+        snapshot_path = self._get_snapshot_path()
+        try:
+            payload = msgpack.unpackb(_read_bytes(snapshot_path), raw=False)
+            
+            # 只比较修改时间先后并不可靠（cp -p/rsync/tar 恢复旧文件、粗粒度时间戳），
+            # 因此要求源文件状态精确匹配
+            if not isinstance(payload, dict) or payload.get("source") != self._source_signature():
+                return None
+            
+            return _construct_trusted_config(payload["config"])
+            
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"加载配置快照失败，回退到配置文件: {e}")
+            return None
+    
+    def _save_snapshot(self, config_dict: Dict[str, Any]) -> None:
+        """保存msgpack配置快照"""
+        if not HAS_MSGPACK:
+            return
+        
+        try:
+            payload = {"source": self._source_signature(), "config": config_dict}
+            with open(self._get_snapshot_path(), 'wb') as f:
+                f.write(msgpack.packb(payload, use_bin_type=True))
+        except Exception as e:
+            logger.warning(f"保存配置快照失败: {e}")
+    
+    def _source_signature(self) -> List[int]:
+        """配置文件的 [mtime_ns, size]，用于判断快照是否对应当前文件"""
+        stat = self._config_file.stat()
+        return [stat.st_mtime_ns, stat.st_size]
+    
     def get_config(self) -> ApplicationConfiguration:
         """获取完整配置"""
         return self._config
@@ -225,14 +331,20 @@ class ConfigurationManager:
             
             # 备份旧配置
             old_config = section_config.dict()
-            
-            # 更新配置
+
+            # 过滤未知配置项
+            known_fields = type(section_config).model_fields
+            updates = {}
             for key, value in config_dict.items():
-                if hasattr(section_config, key):
-                    setattr(section_config, key, value)
+                if key in known_fields:
+                    updates[key] = value
                 else:
                     logger.warning(f"未知配置项: {section}.{key}")
-            
+
+            # 合并后一次性构建并校验新配置段
+            section_config = type(section_config)(**{**old_config, **updates})
+            setattr(self._config, section, section_config)
+
             logger.info(f"配置段更新: {section}")
             
             # 触发配置变更事件
@@ -244,10 +356,64 @@ class ConfigurationManager:
             
             return True
             
-        except (AttributeError, KeyError) as e:
+        except (AttributeError, KeyError, ValueError) as e:
             logger.error(f"更新配置段失败: {e}")
             return False
     
+    def update_values(self, values: Dict[str, Any]) -> bool:
+        """
+        批量设置配置值
+        
+        按配置段分组，每段只合并、校验一次；全部校验通过后才统一生效。
+        
+        Args:
+            values: 配置键路径到新值的映射，如 {'gui.theme': 'dark'}
+            
+        Returns:
+            bool: 更新是否成功
+        """
+        try:
+            # 按配置段分组
+            grouped: Dict[str, Dict[str, Any]] = {}
+            for key_path, value in values.items():
+                section, _, key = key_path.partition('.')
+                if not key or '.' in key:
+                    logger.error(f"无效的配置键路径: {key_path}")
+                    return False
+                grouped.setdefault(section, {})[key] = value
+            
+            # 先构建并校验全部配置段，任何一段失败则不做修改
+            changes = {}
+            for section, updates in grouped.items():
+                section_config = getattr(self._config, section)
+                old_config = section_config.dict()
+                
+                known_fields = type(section_config).model_fields
+                for key in [k for k in updates if k not in known_fields]:
+                    logger.warning(f"未知配置项: {section}.{key}")
+                    del updates[key]
+                
+                changes[section] = (old_config, type(section_config)(**{**old_config, **updates}))
+            
+            for section, (old_config, section_config) in changes.items():
+                setattr(self._config, section, section_config)
+            
+            logger.info(f"配置批量更新: {', '.join(changes)}")
+            
+            # 触发配置变更事件
+            for section, (old_config, section_config) in changes.items():
+                self._notify_watchers('section_changed', {
+                    'section': section,
+                    'old_config': old_config,
+                    'new_config': section_config.dict()
+                })
+            
+            return True
+            
+        except (AttributeError, KeyError, ValueError) as e:
+            logger.error(f"批量更新配置失败: {e}")
+            return False
+    
     def reset_to_default(self, section: Optional[str] = None) -> bool:
         """
         重置配置为默认值
@@ -261,8 +427,11 @@ class ConfigurationManager:
         try:
             if section:
                 # 重置指定段
-                default_section = getattr(DEFAULT_CONFIG, section)
-                setattr(self._config, section, default_section.copy())
+                section_class = SECTION_CLASSES.get(section)
+                if section_class is None:
+                    logger.error(f"未知配置段: {section}")
+                    return False
+                setattr(self._config, section, section_class())
                 logger.info(f"配置段已重置为默认值: {section}")
             else:
                 # 重置全部配置
@@ -356,17 +525,20 @@ class ConfigurationManager:
             export_path = Path(export_path)
             config_dict = self._config.dict()
             
-            with open(export_path, 'w', encoding='utf-8') as f:
-                if format == 'yaml':
-                    yaml.dump(config_dict, f, default_flow_style=False, 
-                             allow_unicode=True, indent=2)
-                elif format == 'json':
+            if format == 'yaml':
+                # 发射器直接编码写入文件，不先生成完整字符串
+                with open(export_path, 'wb') as f:
+                    yaml.dump(config_dict, f, Dumper=_DUMPER, default_flow_style=False, 
+                             allow_unicode=True, indent=2, encoding='utf-8')
+            elif format == 'json':
+                with open(export_path, 'w', encoding='utf-8') as f:
                     json.dump(config_dict, f, indent=2, ensure_ascii=False)
-                elif format == 'toml':
+            elif format == 'toml':
+                with open(export_path, 'w', encoding='utf-8') as f:
                     toml.dump(config_dict, f)
-                else:
-                    logger.error(f"不支持的导出格式: {format}")
-                    return False
+            else:
+                logger.error(f"不支持的导出格式: {format}")
+                return False
             
             logger.info(f"配置导出成功: {export_path}")
             return True
@@ -398,7 +570,8 @@ class ConfigurationManager:
             original_config_file = self._config_file
             self._config_file = import_path
             
-            if self.load_config():
+            # 导入文件旁的快照与其无关，只解析导入文件本身
+            if self.load_config(use_snapshot=False):
                 # 恢复原始配置文件路径
                 self._config_file = original_config_file
                 logger.info(f"配置导入成功: {import_path}")
@@ -4,7 +4,7 @@
 定义所有配置项的数据结构和默认值。
 """
 
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Union, Type
 from pydantic import BaseModel, Field, validator
 from pathlib import Path
 import os
@@ -20,6 +20,9 @@ class ModelConfiguration(BaseModel):
     top_p: float = Field(default=0.9, description="Top-p采样")
     auto_download: bool = Field(default=True, description="自动下载模型")
     download_mirror: str = Field(default="huggingface", description="下载镜像")
+    quantization: Optional[str] = Field(default=None, description="权重量化方式 (int8/nf4/fp4，仅CUDA)")
+    use_amp: bool = Field(default=True, description="CUDA推理时启用自动混合精度")
+    use_compile: bool = Field(default=False, description="CUDA上使用torch.compile编译模型")
     
     @validator("temperature")
     def validate_temperature(cls, v):
@@ -32,6 +35,12 @@ class ModelConfiguration(BaseModel):
         if not 0.0 <= v <= 1.0:
             raise ValueError("top_p must be between 0.0 and 1.0")
         return v
+        
+    @validator("quantization")
+    def validate_quantization(cls, v):
+        if v is not None and v not in ("int8", "nf4", "fp4"):
+            raise ValueError("quantization must be one of int8, nf4, fp4")
+        return v
 
 
 class AgentConfiguration(BaseModel):
@@ -121,6 +130,7 @@ class RuleEngineConfiguration(BaseModel):
     )
     rules_update_interval: int = Field(default=86400, description="规则更新间隔(秒)")
     rule_confidence_threshold: float = Field(default=0.8, description="规则置信度阈值")
+    debug: bool = Field(default=False, description="调试模式，记录全部条件证据及完整实际值")
 
 
 class SecurityConfiguration(BaseModel):
@@ -177,5 +187,18 @@ class ApplicationConfiguration(BaseModel):
         return Path(self.cache_directory) / "rules"
 
 
+# 配置段名称到配置类的映射
+SECTION_CLASSES: Dict[str, Type[BaseModel]] = {
+    "model": ModelConfiguration,
+    "agents": AgentConfiguration,
+    "collectors": CollectorConfiguration,
+    "gui": GUIConfiguration,
+    "updates": UpdateConfiguration,
+    "logging": LoggingConfiguration,
+    "rules": RuleEngineConfiguration,
+    "security": SecurityConfiguration,
+}
+
+
 # 默认配置实例
 DEFAULT_CONFIG = ApplicationConfiguration()
\ No newline at end of file
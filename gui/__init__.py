@@ -5,114 +5,95 @@ SysGraph 主界面
 """
 
 import sys
+import threading
+import string
 import asyncio
-from typing import Optional, Dict, Any
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, List, TYPE_CHECKING
 from datetime import datetime
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QTabWidget,
     QLabel, QPushButton, QProgressBar, QTextEdit, QGroupBox,
     QSystemTrayIcon, QMenu, QStatusBar, QSplitter, QFrame,
-    QGridLayout, QScrollArea, QApplication, QMessageBox
+    QGridLayout, QScrollArea, QApplication, QMessageBox,
+    QCheckBox, QSpinBox, QComboBox, QLineEdit, QFileDialog
 )
-from PyQt6.QtCore import QTimer, QThread, pyqtSignal, Qt, QSize
-from PyQt6.QtGui import QIcon, QFont, QPixmap, QAction
+from PyQt6.QtCore import QTimer, QThread, pyqtSignal, Qt
+from PyQt6.QtGui import QIcon, QFont, QAction, QTextDocument
 from loguru import logger
 
-try:
-    import qdarkstyle
-    HAS_DARK_STYLE = True
-except ImportError:
-    HAS_DARK_STYLE = False
+if TYPE_CHECKING:
+    from PyQt6.QtCore import QRect
 
 from core import ConfigurationManager
 from collectors import DataCollectionManager  
 from models import SystemSnapshot
 
 
-class StartupDataCollectionWorker(QThread):
-    """启动时数据收集工作线程"""
-    
-    # 信号定义
-    progress_updated = pyqtSignal(str)  # 进度状态消息
-    data_collected = pyqtSignal(object)  # 数据收集完成
-    error_occurred = pyqtSignal(str)  # 错误消息
-    
-    def __init__(self, data_collection_manager: DataCollectionManager):
-        super().__init__()
-        self.data_collection_manager = data_collection_manager
-    
-    def run(self):
-        """运行数据收集"""
-        try:
-            self.progress_updated.emit("正在初始化系统...")
-            self.msleep(500)
-            
-            self.progress_updated.emit("正在收集系统信息...")
-            self.msleep(800)
-            
-            self.progress_updated.emit("正在检测硬件设备...")
-            self.msleep(600)
-            
-            self.progress_updated.emit("正在检查网络连接...")
-            self.msleep(400)
-            
-            # 运行在事件循环中的异步操作
-            import asyncio
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            self.progress_updated.emit("正在收集数据...")
-            
-            try:
-                # 收集系统快照
-                snapshot = loop.run_until_complete(
-                    self.data_collection_manager.collect_single_snapshot()
-                )
-                
-                self.progress_updated.emit("数据收集完成")
-                self.msleep(300)
-                
-                self.data_collected.emit(snapshot)
-                
-            finally:
-                loop.close()
-                
-        except Exception as e:
-            logger.error(f"启动数据收集失败: {e}")
-            self.error_occurred.emit(str(e))
+# 诊断报告模板
+_REPORT_TEMPLATE = string.Template("""
+        <h3>🏥 系统诊断报告</h3>
+        <hr>
+        <p><strong>📊 系统健康评分:</strong> <span style="color: ${score_color}; font-size: 18px;">${score}%</span></p>
+        <p><strong>⚠️  发现问题:</strong> ${issues} 个</p>
+        <p><strong>💡 优化建议:</strong> ${recommendations} 条</p>
+        <p><strong>⏱️  诊断耗时:</strong> ${diagnosis_time} 秒</p>
+        <hr>
+        
+        <h4>🔍 主要发现:</h4>
+        <ul>
+        ${findings}
+        </ul>
+        
+        <h4>📋 优化建议:</h4>
+        <ul>
+            <li>🧹 定期清理临时文件和缓存</li>
+            <li>🔄 保持系统和软件更新</li>
+            <li>📊 监控系统性能指标</li>
+        </ul>
+        """)
 
+# 主要发现列表片段
+_FINDINGS_ISSUES = (
+    "<li>🔴 检测到CPU使用率偏高，建议关闭不必要的程序</li>"
+    "<li>🟡 内存使用率较高，可考虑增加内存容量</li>"
+)
+_FINDINGS_OK = "<li>✅ 系统运行状态良好，未发现异常</li>"
 
-class SystemRefreshWorker(QThread):
-    """系统信息刷新工作线程"""
-    
-    # 信号定义
-    data_updated = pyqtSignal(object)  # 数据更新完成
-    
-    def __init__(self, data_collection_manager: DataCollectionManager):
-        super().__init__()
-        self.data_collection_manager = data_collection_manager
-    
-    def run(self):
-        """运行数据刷新"""
-        try:
-            # 在线程中创建新的事件循环
-            import asyncio
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            try:
-                # 收集系统快照
-                snapshot = loop.run_until_complete(
-                    self.data_collection_manager.collect_single_snapshot()
-                )
-                
-                self.data_updated.emit(snapshot)
-                
-            finally:
-                loop.close()
-                
-        except Exception as e:
-            logger.error(f"系统信息刷新失败: {e}")
+# 进度条颜色状态
+_PROGRESS_STATE_COLORS = {
+    "red": "#e74c3c",
+    "orange": "#f39c12",
+    "green": "#27ae60",
+    "blue": "#3498db",
+}
+
+# 进度条样式表，按 state 动态属性选择颜色
+_PROGRESS_QSS = "\n".join(
+    f'QProgressBar[state="{state}"]::chunk {{ background-color: {color}; }}'
+    for state, color in _PROGRESS_STATE_COLORS.items()
+)
+
+
+def _set_progress_state(progress_bar: QProgressBar, state: str) -> None:
+    """切换进度条颜色状态，状态变化时只重新应用该进度条的样式"""
+    if progress_bar.property("state") == state:
+        return
+    progress_bar.setProperty("state", state)
+    style = progress_bar.style()
+    style.unpolish(progress_bar)
+    style.polish(progress_bar)
+
+# 主屏幕几何信息缓存，首次使用时查询
+_PRIMARY_GEOMETRY: Optional["QRect"] = None
+
+
+def _primary_screen_geometry() -> "QRect":
+    """获取主屏幕几何信息，仅在首次调用时访问平台插件"""
+    global _PRIMARY_GEOMETRY
+    if _PRIMARY_GEOMETRY is None:
+        _PRIMARY_GEOMETRY = QApplication.primaryScreen().geometry()
+    return _PRIMARY_GEOMETRY
 
 
 class DiagnosisWorker(QThread):
@@ -123,10 +104,24 @@ class DiagnosisWorker(QThread):
     diagnosis_completed = pyqtSignal(dict)  # 诊断结果
     error_occurred = pyqtSignal(str)  # 错误消息
     
+    # 诊断步骤: (状态, 进度, 消息)
+    DIAGNOSIS_STEPS = [
+        ("collecting", 20, "收集系统信息..."),
+        ("analyzing", 40, "分析硬件状态..."),
+        ("checking", 60, "检查网络连通性..."),
+        ("processing", 80, "AI智能体分析中..."),
+        ("completing", 100, "生成诊断报告...")
+    ]
+    
     def __init__(self, config_manager: ConfigurationManager):
         super().__init__()
         self.config_manager = config_manager
         self.is_running = False
+        self._stop_event = threading.Event()  # 停止请求，可立即打断等待
+    
+    def _wait_interruptible(self, msecs: int) -> bool:
+        """等待指定毫秒数，收到停止请求时立即返回True"""
+        return self._stop_event.wait(msecs / 1000)
     
     def run(self):
         """运行诊断"""
@@ -135,19 +130,10 @@ class DiagnosisWorker(QThread):
             self.progress_updated.emit("starting", 0, "正在启动诊断...")
             
             # 模拟诊断过程
-            steps = [
-                ("collecting", 20, "收集系统信息..."),
-                ("analyzing", 40, "分析硬件状态..."),
-                ("checking", 60, "检查网络连通性..."),
-                ("processing", 80, "AI智能体分析中..."),
-                ("completing", 100, "生成诊断报告...")
-            ]
-            
-            for status, progress, message in steps:
-                if not self.is_running:
-                    break
+            for status, progress, message in self.DIAGNOSIS_STEPS:
                 self.progress_updated.emit(status, progress, message)
-                self.msleep(1000)  # 模拟工作时间
+                if self._wait_interruptible(1000):  # 模拟工作时间，停止请求会立即打断
+                    break
             
             if self.is_running:
                 # 模拟诊断结果
@@ -168,6 +154,7 @@ class DiagnosisWorker(QThread):
     def stop(self):
         """停止诊断"""
         self.is_running = False
+        self._stop_event.set()
 
 
 class SystemInfoWidget(QWidget):
@@ -175,6 +162,7 @@ class SystemInfoWidget(QWidget):
     
     def __init__(self):
         super().__init__()
+        self._last_text: Dict[QLabel, str] = {}  # 各标签当前文本
         self.init_ui()
         
     def init_ui(self):
@@ -225,14 +213,17 @@ class SystemInfoWidget(QWidget):
         
         layout.addStretch()
         self.setLayout(layout)
+        
+        # 安装一次进度条颜色样式表，之后仅切换状态属性
+        self.setStyleSheet(_PROGRESS_QSS)
     
     def update_system_info(self, snapshot: Optional[SystemSnapshot] = None):
         """更新系统信息显示"""
         if snapshot:
             # 更新系统信息
             system_info = snapshot.system.system_info
-            self.hostname_label.setText(f"主机名: {system_info.hostname}")
-            self.platform_label.setText(f"平台: {system_info.system}")
+            self._set_label_text(self.hostname_label, f"主机名: {system_info.hostname}")
+            self._set_label_text(self.platform_label, f"平台: {system_info.system}")
             
             uptime_hours = system_info.uptime / 3600
             if uptime_hours < 24:
@@ -240,7 +231,7 @@ class SystemInfoWidget(QWidget):
             else:
                 uptime_days = uptime_hours / 24
                 uptime_str = f"{uptime_days:.1f} 天"
-            self.uptime_label.setText(f"运行时间: {uptime_str}")
+            self._set_label_text(self.uptime_label, f"运行时间: {uptime_str}")
             
             # 更新硬件信息
             hardware = snapshot.hardware
@@ -248,14 +239,12 @@ class SystemInfoWidget(QWidget):
             memory_usage = int(hardware.memory.usage_percent)
             
             # 计算平均磁盘使用率
-            if hardware.disks:
-                disk_usage = int(sum(disk.usage_percent for disk in hardware.disks) / len(hardware.disks))
-            else:
-                disk_usage = 0
+            disk_usages = hardware.disk_usage_percent
+            disk_usage = int(disk_usages.mean()) if disk_usages.size else 0
             
-            self.cpu_label.setText(f"CPU使用率: {cpu_usage}%")
-            self.memory_label.setText(f"内存使用率: {memory_usage}%")
-            self.disk_label.setText(f"磁盘使用率: {disk_usage}%")
+            self._set_label_text(self.cpu_label, f"CPU使用率: {cpu_usage}%")
+            self._set_label_text(self.memory_label, f"内存使用率: {memory_usage}%")
+            self._set_label_text(self.disk_label, f"磁盘使用率: {disk_usage}%")
             
             # 更新进度条
             self.cpu_progress.setValue(cpu_usage)
@@ -267,20 +256,20 @@ class SystemInfoWidget(QWidget):
             self._set_progress_color(self.memory_progress, memory_usage)
             self._set_progress_color(self.disk_progress, disk_usage)
     
+    def _set_label_text(self, label: QLabel, text: str):
+        """设置标签文本，文本未变化时跳过以避免重新布局和重绘"""
+        if self._last_text.get(label) != text:
+            label.setText(text)
+            self._last_text[label] = text
+    
     def _set_progress_color(self, progress_bar: QProgressBar, value: int):
         """设置进度条颜色"""
         if value > 90:
-            color = "#e74c3c"  # 红色
+            _set_progress_state(progress_bar, "red")
         elif value > 70:
-            color = "#f39c12"  # 橙色
+            _set_progress_state(progress_bar, "orange")
         else:
-            color = "#27ae60"  # 绿色
-        
-        progress_bar.setStyleSheet(f"""
-            QProgressBar::chunk {{
-                background-color: {color};
-            }}
-        """)
+            _set_progress_state(progress_bar, "green")
 
 
 class DiagnosisWidget(QWidget):
@@ -334,11 +323,20 @@ class DiagnosisWidget(QWidget):
         self.result_text.setReadOnly(True)
         self.result_text.setMinimumHeight(200)
         
+        # 结果文档常驻复用，只读展示无需撤销栈
+        self._result_doc = QTextDocument(self.result_text)
+        self._result_doc.setUndoRedoEnabled(False)
+        self.result_text.setDocument(self._result_doc)
+        self._result_html: Optional[str] = None
+        
         result_layout.addWidget(self.result_text)
         result_group.setLayout(result_layout)
         layout.addWidget(result_group)
         
         self.setLayout(layout)
+        
+        # 安装一次进度条颜色样式表，之后仅切换状态属性
+        self.setStyleSheet(_PROGRESS_QSS)
     
     def update_progress(self, status: str, progress: int, message: str):
         """更新诊断进度"""
@@ -347,17 +345,11 @@ class DiagnosisWidget(QWidget):
         
         # 根据状态设置进度条颜色
         if status == "error":
-            color = "#e74c3c"
+            _set_progress_state(self.progress_bar, "red")
         elif status == "completing":
-            color = "#27ae60"
+            _set_progress_state(self.progress_bar, "green")
         else:
-            color = "#3498db"
-        
-        self.progress_bar.setStyleSheet(f"""
-            QProgressBar::chunk {{
-                background-color: {color};
-            }}
-        """)
+            _set_progress_state(self.progress_bar, "blue")
     
     def show_diagnosis_result(self, result: Dict[str, Any]):
         """显示诊断结果"""
@@ -366,42 +358,46 @@ class DiagnosisWidget(QWidget):
         recommendations_count = result.get('recommendations_count', 0)
         diagnosis_time = result.get('diagnosis_time', 0)
         
-        result_html = f"""
-        <h3>🏥 系统诊断报告</h3>
-        <hr>
-        <p><strong>📊 系统健康评分:</strong> <span style="color: {'#27ae60' if health_score > 80 else '#f39c12' if health_score > 60 else '#e74c3c'}; font-size: 18px;">{health_score:.1f}%</span></p>
-        <p><strong>⚠️  发现问题:</strong> {issues_count} 个</p>
-        <p><strong>💡 优化建议:</strong> {recommendations_count} 条</p>
-        <p><strong>⏱️  诊断耗时:</strong> {diagnosis_time:.1f} 秒</p>
-        <hr>
-        
-        <h4>🔍 主要发现:</h4>
-        <ul>
-        """
-        
-        if issues_count > 0:
-            result_html += "<li>🔴 检测到CPU使用率偏高，建议关闭不必要的程序</li>"
-            result_html += "<li>🟡 内存使用率较高，可考虑增加内存容量</li>"
+        if health_score > 80:
+            score_color = "#27ae60"
+        elif health_score > 60:
+            score_color = "#f39c12"
         else:
-            result_html += "<li>✅ 系统运行状态良好，未发现异常</li>"
-        
-        result_html += """
-        </ul>
-        
-        <h4>📋 优化建议:</h4>
-        <ul>
-            <li>🧹 定期清理临时文件和缓存</li>
-            <li>🔄 保持系统和软件更新</li>
-            <li>📊 监控系统性能指标</li>
-        </ul>
-        """
+            score_color = "#e74c3c"
+        
+        result_html = _REPORT_TEMPLATE.substitute(
+            score_color=score_color,
+            score=f"{health_score:.1f}",
+            issues=issues_count,
+            recommendations=recommendations_count,
+            diagnosis_time=f"{diagnosis_time:.1f}",
+            findings=_FINDINGS_ISSUES if issues_count > 0 else _FINDINGS_OK
+        )
         
-        self.result_text.setHtml(result_html)
+        # 报告内容未变化时跳过HTML重新解析与排版
+        if result_html != self._result_html:
+            self._result_doc.setHtml(result_html)
+            self._result_html = result_html
 
 
 class SysGraphMainWindow(QMainWindow):
     """主窗口"""
     
+    # 字体缓存，按 (字号, 是否粗体) 索引；QFont需在QApplication创建后构建，因此延迟初始化
+    _FONTS: Dict[tuple, QFont] = {}
+    
+    @classmethod
+    def _get_font(cls, point_size: int, bold: bool = False) -> QFont:
+        """获取缓存的字体"""
+        key = (point_size, bold)
+        font = cls._FONTS.get(key)
+        if font is None:
+            font = QFont()
+            font.setPointSize(point_size)
+            font.setBold(bold)
+            cls._FONTS[key] = font
+        return font
+    
     def __init__(self, config_manager: ConfigurationManager):
         super().__init__()
         self.config_manager = config_manager
@@ -413,6 +409,25 @@ class SysGraphMainWindow(QMainWindow):
         self.is_startup_loading = True
         self.startup_data_ready = False
         self.data_collection_manager: Optional[DataCollectionManager] = None
+        # 常驻刷新任务，刷新请求通过事件合并传递
+        self._refresh_requested = asyncio.Event()
+        self._refresh_task: Optional[asyncio.Future] = None
+        self._refresh_stale = False  # 窗口隐藏期间跳过了刷新
+        
+        # 时间显示的日期+小时前缀缓存
+        self._time_prefix_key: Optional[tuple] = None
+        self._time_prefix = ""
+        
+        # 缓存GUI配置段，配置替换时由监听器刷新
+        self._gui_cfg = self.config_manager.get_section('gui')
+        for event_type in ('config_loaded', 'section_changed', 'config_reset'):
+            self.config_manager.add_watcher(event_type, self._on_gui_cfg_changed)
+        
+        # 加载阶段轮播定时器
+        self._pending_stages: List[str] = []
+        self._stage_timer = QTimer(self)
+        self._stage_timer.setInterval(400)
+        self._stage_timer.timeout.connect(self._advance_loading_stage)
         
         # 初始化加载界面
         self.init_loading_ui()
@@ -438,18 +453,13 @@ class SysGraphMainWindow(QMainWindow):
         # 标题
         title_label = QLabel("SysGraph")
         title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        title_font = QFont()
-        title_font.setPointSize(24)
-        title_font.setBold(True)
-        title_label.setFont(title_font)
+        title_label.setFont(self._get_font(24, bold=True))
         loading_layout.addWidget(title_label)
         
         # 副标题
         subtitle_label = QLabel("智能系统诊断工具")
         subtitle_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        subtitle_font = QFont()
-        subtitle_font.setPointSize(12)
-        subtitle_label.setFont(subtitle_font)
+        subtitle_label.setFont(self._get_font(12))
         subtitle_label.setStyleSheet("color: #666;")
         loading_layout.addWidget(subtitle_label)
         
@@ -473,10 +483,15 @@ class SysGraphMainWindow(QMainWindow):
         # 居中显示
         self.center_window()
     
+    def _on_gui_cfg_changed(self, data: Any = None):
+        """配置变更后刷新缓存的GUI配置段"""
+        self._gui_cfg = self.config_manager.get_section('gui')
+    
     def center_window(self):
         """将窗口居中显示"""
-        screen = QApplication.primaryScreen().geometry()
-        window = self.geometry()
+        screen = _primary_screen_geometry()
+        # 显示前按尺寸约束估算窗口大小，避免强制完成一次几何布局
+        window = self.sizeHint().expandedTo(self.minimumSize()).boundedTo(self.maximumSize())
         x = (screen.width() - window.width()) // 2
         y = (screen.height() - window.height()) // 2
         self.move(x, y)
@@ -496,22 +511,54 @@ class SysGraphMainWindow(QMainWindow):
             # 创建数据收集管理器
             self.data_collection_manager = DataCollectionManager(collector_config)
             
-            # 创建并启动数据收集线程
-            self.startup_worker = StartupDataCollectionWorker(self.data_collection_manager)
-            self.startup_worker.progress_updated.connect(self.update_loading_status)
-            self.startup_worker.data_collected.connect(self.on_startup_data_ready)
-            self.startup_worker.error_occurred.connect(self.on_startup_error)
-            self.startup_worker.start()
+            # 在Qt事件循环中调度数据收集协程
+            self._startup_task = asyncio.ensure_future(self._collect_startup_data())
             
         except Exception as e:
             logger.error(f"启动数据收集初始化失败: {e}")
             self.on_startup_error(str(e))
     
+    async def _collect_startup_data(self):
+        """运行启动时数据收集"""
+        try:
+            self.update_loading_status("正在初始化系统...")
+            
+            # 收集系统快照，收集器一次性给出全部阶段，由界面定时器轮播显示
+            snapshot = await self.data_collection_manager.collect_single_snapshot(
+                progress_callback=self.show_loading_stages
+            )
+            
+            self._stage_timer.stop()
+            self.update_loading_status("数据收集完成")
+            
+            self.on_startup_data_ready(snapshot)
+            
+        except Exception as e:
+            logger.error(f"启动数据收集失败: {e}")
+            # 模态对话框不能在协程内弹出，交回Qt事件循环处理
+            self._stage_timer.stop()
+            error_message = str(e)
+            QTimer.singleShot(0, lambda: self.on_startup_error(error_message))
+    
     def update_loading_status(self, status: str):
         """更新加载状态"""
         self.loading_status.setText(status)
         logger.info(f"加载状态: {status}")
     
+    def show_loading_stages(self, stages: List[str]):
+        """依次轮播显示加载阶段，全部在主线程定时器中完成"""
+        self._pending_stages = list(stages)
+        self._advance_loading_stage()
+        if self._pending_stages:
+            self._stage_timer.start()
+    
+    def _advance_loading_stage(self):
+        """显示下一个加载阶段"""
+        if not self._pending_stages:
+            self._stage_timer.stop()
+            return
+        self.update_loading_status(self._pending_stages.pop(0))
+    
     def on_startup_data_ready(self, snapshot):
         """启动数据准备完成"""
         self.startup_data_ready = True
@@ -538,6 +585,7 @@ class SysGraphMainWindow(QMainWindow):
         
         # 重新初始化主界面
         self.setMaximumSize(16777215, 16777215)  # 取消尺寸限制
+        self._build_actions()
         self.init_ui()
         self.setup_tray_icon()
         self.setup_timers()
@@ -556,9 +604,12 @@ class SysGraphMainWindow(QMainWindow):
         # 设置应用图标
         self.setWindowIcon(QIcon())  # 实际使用时需要添加图标文件
         
-        # 应用主题
-        if HAS_DARK_STYLE:
+        # 应用主题（qdarkstyle导入较慢，仅在主界面初始化时加载）
+        try:
+            import qdarkstyle
             self.setStyleSheet(qdarkstyle.load_stylesheet_pyqt6())
+        except ImportError:
+            pass
         
         # 创建中央窗口
         central_widget = QWidget()
@@ -623,10 +674,7 @@ class SysGraphMainWindow(QMainWindow):
         
         # 系统概览标题
         title_label = QLabel("📊 系统概览")
-        title_font = QFont()
-        title_font.setPointSize(16)
-        title_font.setBold(True)
-        title_label.setFont(title_font)
+        title_label.setFont(self._get_font(16, bold=True))
         layout.addWidget(title_label)
         
         # 系统状态卡片
@@ -678,9 +726,10 @@ class SysGraphMainWindow(QMainWindow):
         card = QGroupBox(title)
         layout = QVBoxLayout()
         
-        for info in info_list:
-            label = QLabel(info)
-            layout.addWidget(label)
+        # 所有信息行合并为一个富文本标签
+        card_body = QLabel("<br>".join(info_list))
+        card_body.setTextFormat(Qt.TextFormat.RichText)
+        layout.addWidget(card_body)
         
         card.setLayout(layout)
         return card
@@ -692,10 +741,7 @@ class SysGraphMainWindow(QMainWindow):
         
         # 配置标题
         title_label = QLabel("⚙️ 系统配置")
-        title_font = QFont()
-        title_font.setPointSize(16)
-        title_font.setBold(True)
-        title_label.setFont(title_font)
+        title_label.setFont(self._get_font(16, bold=True))
         layout.addWidget(title_label)
         
         # 创建配置内容的滚动区域
@@ -748,8 +794,6 @@ class SysGraphMainWindow(QMainWindow):
     
     def create_gui_config_group(self) -> QGroupBox:
         """创建 GUI 配置组"""
-        from PyQt6.QtWidgets import QCheckBox, QSpinBox, QComboBox
-        
         group = QGroupBox("🎨 界面配置")
         layout = QGridLayout()
         
@@ -816,8 +860,6 @@ class SysGraphMainWindow(QMainWindow):
     
     def create_collector_config_group(self) -> QGroupBox:
         """创建收集器配置组"""
-        from PyQt6.QtWidgets import QSpinBox
-        
         group = QGroupBox("📋 数据收集配置")
         layout = QGridLayout()
         
@@ -853,13 +895,11 @@ class SysGraphMainWindow(QMainWindow):
     
     def create_update_config_group(self) -> QGroupBox:
         """创建更新配置组"""
-        from PyQt6.QtWidgets import QCheckBox, QSpinBox, QLineEdit
-        
         group = QGroupBox("🔄 更新配置")
         layout = QGridLayout()
         
         # 获取当前配置
-        update_config = self.config_manager.get_section('update')
+        update_config = self.config_manager.get_section('updates')
         
         # 自动检查更新
         self.auto_check_updates_check = QCheckBox("自动检查更新")
@@ -894,29 +934,30 @@ class SysGraphMainWindow(QMainWindow):
     def save_config(self):
         """保存配置"""
         try:
-            # 保存 GUI 配置
-            self.config_manager.set_value('gui.theme', self.theme_combo.currentText())
-            self.config_manager.set_value('gui.language', self.language_combo.currentText())
-            self.config_manager.set_value('gui.window_width', self.window_width_spin.value())
-            self.config_manager.set_value('gui.window_height', self.window_height_spin.value())
-            self.config_manager.set_value('gui.show_system_tray', self.show_tray_check.isChecked())
-            self.config_manager.set_value('gui.minimize_to_tray', self.minimize_tray_check.isChecked())
-            self.config_manager.set_value('gui.enable_notifications', self.enable_notifications_check.isChecked())
-            self.config_manager.set_value('gui.refresh_interval', self.refresh_interval_spin.value())
-            
-            # 保存收集器配置
-            self.config_manager.set_value('collectors.max_processes', self.max_processes_spin.value())
-            self.config_manager.set_value('collectors.collection_interval', self.collection_interval_spin.value())
-            self.config_manager.set_value('collectors.network_timeout', self.network_timeout_spin.value())
-            
-            # 保存更新配置
-            self.config_manager.set_value('update.auto_check_updates', self.auto_check_updates_check.isChecked())
-            self.config_manager.set_value('update.repository_url', self.repository_url_edit.text())
-            self.config_manager.set_value('update.check_interval', self.check_interval_spin.value())
-            self.config_manager.set_value('update.backup_before_update', self.backup_before_update_check.isChecked())
+            # 一次批量更新全部配置项，每个配置段只校验和通知一次
+            updated = self.config_manager.update_values({
+                # GUI 配置
+                'gui.theme': self.theme_combo.currentText(),
+                'gui.language': self.language_combo.currentText(),
+                'gui.window_width': self.window_width_spin.value(),
+                'gui.window_height': self.window_height_spin.value(),
+                'gui.show_system_tray': self.show_tray_check.isChecked(),
+                'gui.minimize_to_tray': self.minimize_tray_check.isChecked(),
+                'gui.enable_notifications': self.enable_notifications_check.isChecked(),
+                'gui.refresh_interval': self.refresh_interval_spin.value(),
+                # 收集器配置
+                'collectors.max_processes': self.max_processes_spin.value(),
+                'collectors.collection_interval': self.collection_interval_spin.value(),
+                'collectors.network_timeout': self.network_timeout_spin.value(),
+                # 更新配置
+                'updates.auto_check_updates': self.auto_check_updates_check.isChecked(),
+                'updates.repository_url': self.repository_url_edit.text(),
+                'updates.check_interval': self.check_interval_spin.value(),
+                'updates.backup_before_update': self.backup_before_update_check.isChecked(),
+            })
             
             # 保存到文件
-            if self.config_manager.save_config():
+            if updated and self.config_manager.save_config():
                 QMessageBox.information(self, "成功", "配置已保存！")
                 logger.info("配置已保存")
             else:
@@ -948,8 +989,6 @@ class SysGraphMainWindow(QMainWindow):
     
     def export_config(self):
         """导出配置"""
-        from PyQt6.QtWidgets import QFileDialog
-        
         file_path, _ = QFileDialog.getSaveFileName(
             self, "导出配置", 
             "config.yaml",
@@ -969,8 +1008,6 @@ class SysGraphMainWindow(QMainWindow):
     
     def import_config(self):
         """导入配置"""
-        from PyQt6.QtWidgets import QFileDialog
-        
         file_path, _ = QFileDialog.getOpenFileName(
             self, "导入配置", 
             "",
@@ -996,39 +1033,43 @@ class SysGraphMainWindow(QMainWindow):
                     QMessageBox.critical(self, "错误", f"导入配置时发生错误：{e}")
                     logger.error(f"导入配置失败: {e}")
     
+    def _build_actions(self):
+        """创建共享动作表，菜单栏与托盘菜单复用同一组QAction"""
+        # 动作ID: (文本, 快捷键, 槽函数)
+        action_specs = {
+            'start_diagnosis': ('开始诊断(&S)', 'Ctrl+S', self.start_diagnosis),
+            'close': ('退出(&Q)', 'Ctrl+Q', self.close),
+            'refresh': ('刷新系统信息(&R)', 'F5', self.refresh_system_info),
+            'about': ('关于(&A)', None, self.show_about),
+            'show_window': ('显示主窗口', None, self.show),
+            'quit': ('退出', None, self.quit_application),
+        }
+        
+        self._actions: Dict[str, QAction] = {}
+        for action_id, (text, shortcut, slot) in action_specs.items():
+            action = QAction(text, self)
+            if shortcut:
+                action.setShortcut(shortcut)
+            action.triggered.connect(slot)
+            self._actions[action_id] = action
+    
     def create_menu_bar(self):
         """创建菜单栏"""
         menubar = self.menuBar()
         
         # 文件菜单
         file_menu = menubar.addMenu('文件(&F)')
-        
-        start_action = QAction('开始诊断(&S)', self)
-        start_action.setShortcut('Ctrl+S')
-        start_action.triggered.connect(self.start_diagnosis)
-        file_menu.addAction(start_action)
-        
+        file_menu.addAction(self._actions['start_diagnosis'])
         file_menu.addSeparator()
-        
-        exit_action = QAction('退出(&Q)', self)
-        exit_action.setShortcut('Ctrl+Q')
-        exit_action.triggered.connect(self.close)
-        file_menu.addAction(exit_action)
+        file_menu.addAction(self._actions['close'])
         
         # 视图菜单
         view_menu = menubar.addMenu('视图(&V)')
-        
-        refresh_action = QAction('刷新系统信息(&R)', self)
-        refresh_action.setShortcut('F5')
-        refresh_action.triggered.connect(self.refresh_system_info)
-        view_menu.addAction(refresh_action)
+        view_menu.addAction(self._actions['refresh'])
         
         # 帮助菜单
         help_menu = menubar.addMenu('帮助(&H)')
-        
-        about_action = QAction('关于(&A)', self)
-        about_action.triggered.connect(self.show_about)
-        help_menu.addAction(about_action)
+        help_menu.addAction(self._actions['about'])
     
     def create_status_bar(self):
         """创建状态栏"""
@@ -1038,10 +1079,12 @@ class SysGraphMainWindow(QMainWindow):
         # 添加状态标签
         self.status_label = QLabel("就绪")
         self.status_bar.addWidget(self.status_label)
+        self._last_status = "就绪"
         
         # 添加时间标签
         self.time_label = QLabel()
         self.status_bar.addPermanentWidget(self.time_label)
+        self._last_time = ""
         
         # 更新时间
         self.update_time()
@@ -1056,27 +1099,16 @@ class SysGraphMainWindow(QMainWindow):
         
         # 创建托盘菜单
         tray_menu = QMenu()
-        
-        show_action = QAction("显示主窗口", self)
-        show_action.triggered.connect(self.show)
-        tray_menu.addAction(show_action)
-        
+        tray_menu.addAction(self._actions['show_window'])
         tray_menu.addSeparator()
-        
-        start_diagnosis_action = QAction("开始诊断", self)
-        start_diagnosis_action.triggered.connect(self.start_diagnosis)
-        tray_menu.addAction(start_diagnosis_action)
-        
+        tray_menu.addAction(self._actions['start_diagnosis'])
         tray_menu.addSeparator()
-        
-        quit_action = QAction("退出", self)
-        quit_action.triggered.connect(self.quit_application)
-        tray_menu.addAction(quit_action)
+        tray_menu.addAction(self._actions['quit'])
         
         self.tray_icon.setContextMenu(tray_menu)
         self.tray_icon.activated.connect(self.tray_icon_activated)
         
-        config = self.config_manager.get_section('gui')
+        config = self._gui_cfg
         if config and config.show_system_tray:
             self.tray_icon.show()
     
@@ -1085,7 +1117,7 @@ class SysGraphMainWindow(QMainWindow):
         # 系统信息更新定时器
         self.system_timer.timeout.connect(self.refresh_system_info)
         
-        config = self.config_manager.get_section('gui')
+        config = self._gui_cfg
         if config:
             interval = config.refresh_interval * 1000  # 转换为毫秒
             self.system_timer.start(interval)
@@ -1097,7 +1129,7 @@ class SysGraphMainWindow(QMainWindow):
     
     def load_window_config(self):
         """加载窗口配置"""
-        config = self.config_manager.get_section('gui')
+        config = self._gui_cfg
         if config:
             self.resize(config.window_width, config.window_height)
     
@@ -1107,19 +1139,35 @@ class SysGraphMainWindow(QMainWindow):
             return
         
         logger.info("开始系统诊断")
-        self.status_label.setText("正在进行系统诊断...")
+        self._set_status("正在进行系统诊断...")
         
         # 更新按钮状态
-        self.diagnosis_widget.start_button.setEnabled(False)
-        self.diagnosis_widget.stop_button.setEnabled(True)
+        self._set_diagnosis_running(True)
         
         # 创建并启动工作线程
         self.diagnosis_worker = DiagnosisWorker(self.config_manager)
         self.diagnosis_worker.progress_updated.connect(self.diagnosis_widget.update_progress)
         self.diagnosis_worker.diagnosis_completed.connect(self.on_diagnosis_completed)
         self.diagnosis_worker.error_occurred.connect(self.on_diagnosis_error)
+        
         self.diagnosis_worker.start()
     
+    @contextmanager
+    def _batched_updates(self):
+        """暂停窗口重绘，多个界面修改完成后统一重绘一次"""
+        self.setUpdatesEnabled(False)
+        try:
+            yield
+        finally:
+            self.setUpdatesEnabled(True)
+            self.update()
+    
+    def _set_diagnosis_running(self, running: bool):
+        """同步诊断按钮与共享动作的可用状态"""
+        self.diagnosis_widget.start_button.setEnabled(not running)
+        self.diagnosis_widget.stop_button.setEnabled(running)
+        self._actions['start_diagnosis'].setEnabled(not running)
+    
     def stop_diagnosis(self):
         """停止诊断"""
         if self.diagnosis_worker and self.diagnosis_worker.isRunning():
@@ -1127,26 +1175,26 @@ class SysGraphMainWindow(QMainWindow):
             self.diagnosis_worker.wait()
         
         logger.info("诊断已停止")
-        self.status_label.setText("诊断已停止")
-        
-        # 更新按钮状态
-        self.diagnosis_widget.start_button.setEnabled(True)
-        self.diagnosis_widget.stop_button.setEnabled(False)
+        with self._batched_updates():
+            self._set_status("诊断已停止")
+            
+            # 更新按钮状态
+            self._set_diagnosis_running(False)
     
     def on_diagnosis_completed(self, result: Dict[str, Any]):
         """诊断完成回调"""
         logger.info("系统诊断完成")
-        self.status_label.setText("诊断完成")
-        
-        # 显示结果
-        self.diagnosis_widget.show_diagnosis_result(result)
-        
-        # 更新按钮状态
-        self.diagnosis_widget.start_button.setEnabled(True)
-        self.diagnosis_widget.stop_button.setEnabled(False)
+        with self._batched_updates():
+            self._set_status("诊断完成")
+            
+            # 显示结果
+            self.diagnosis_widget.show_diagnosis_result(result)
+            
+            # 更新按钮状态
+            self._set_diagnosis_running(False)
         
         # 显示通知
-        config = self.config_manager.get_section('gui')
+        config = self._gui_cfg
         if config and config.enable_notifications and self.tray_icon:
             health_score = result.get('overall_health_score', 0) * 100
             self.tray_icon.showMessage(
@@ -1159,21 +1207,25 @@ class SysGraphMainWindow(QMainWindow):
     def on_diagnosis_error(self, error_message: str):
         """诊断错误回调"""
         logger.error(f"诊断过程出错: {error_message}")
-        self.status_label.setText(f"诊断错误: {error_message}")
-        
-        # 更新按钮状态
-        self.diagnosis_widget.start_button.setEnabled(True)
-        self.diagnosis_widget.stop_button.setEnabled(False)
+        with self._batched_updates():
+            self._set_status(f"诊断错误: {error_message}")
+            
+            # 更新按钮状态
+            self._set_diagnosis_running(False)
         
-        # 显示错误对话框
+        # 显示错误对话框（需在恢复重绘之后弹出）
         QMessageBox.critical(self, "诊断错误", f"诊断过程中发生错误:\n{error_message}")
     
     def refresh_system_info(self):
         """刷新系统信息"""
+        # 窗口隐藏（如最小化到托盘）时不采集，重新显示时再刷新
+        if not self.isVisible():
+            self._refresh_stale = True
+            return
+        
         try:
             if self.data_collection_manager and self.startup_data_ready:
-                # 使用后台线程收集数据，避免阻塞主线程
-                self._start_background_refresh()
+                self.request_refresh()
             else:
                 # 初始化阶段或数据收集器不可用，使用默认数据
                 self.system_info_widget.update_system_info(None)
@@ -1184,14 +1236,26 @@ class SysGraphMainWindow(QMainWindow):
             # 发生错误时使用默认数据
             self.system_info_widget.update_system_info(None)
     
-    def _start_background_refresh(self):
-        """在后台线程中刷新数据"""
-        if hasattr(self, 'refresh_worker') and self.refresh_worker.isRunning():
-            return  # 已经有刷新任务在运行
-        
-        self.refresh_worker = SystemRefreshWorker(self.data_collection_manager)
-        self.refresh_worker.data_updated.connect(self._on_data_refreshed)
-        self.refresh_worker.start()
+    def request_refresh(self):
+        """请求一次后台刷新，采集进行中的多次请求合并为下一轮采集"""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.ensure_future(self._refresh_loop())
+        self._refresh_requested.set()
+    
+    async def _refresh_loop(self):
+        """常驻刷新循环：等待刷新请求，在执行器中采集，不阻塞主线程"""
+        while True:
+            await self._refresh_requested.wait()
+            self._refresh_requested.clear()
+            
+            try:
+                snapshot = await self.data_collection_manager.collect_single_snapshot()
+            except Exception as e:
+                logger.error(f"刷新系统信息失败: {e}")
+                self.system_info_widget.update_system_info(None)
+                continue
+            
+            self._on_data_refreshed(snapshot)
     
     def _on_data_refreshed(self, snapshot):
         """数据刷新完成回调"""
@@ -1201,10 +1265,27 @@ class SysGraphMainWindow(QMainWindow):
         except Exception as e:
             logger.error(f"更新系统信息显示失败: {e}")
     
+    def _set_status(self, message: str):
+        """设置状态栏消息，内容未变化时跳过"""
+        if message != self._last_status:
+            self.status_label.setText(message)
+            self._last_status = message
+    
     def update_time(self):
         """更新时间显示"""
-        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.time_label.setText(current_time)
+        now = datetime.now()
+        
+        # 日期和小时部分只在整点变化时重新格式化
+        hour_key = (now.date(), now.hour)
+        if hour_key != self._time_prefix_key:
+            self._time_prefix_key = hour_key
+            self._time_prefix = now.strftime("%Y-%m-%d %H:")
+        
+        current_time = f"{self._time_prefix}{now.minute:02d}:{now.second:02d}"
+        # 计时器抖动导致同一秒内重复触发时不重复设置文本
+        if current_time != self._last_time:
+            self.time_label.setText(current_time)
+            self._last_time = current_time
     
     def tray_icon_activated(self, reason):
         """托盘图标激活回调"""
@@ -1242,11 +1323,24 @@ class SysGraphMainWindow(QMainWindow):
         if self.tray_icon:
             self.tray_icon.hide()
         
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+        
+        if self.data_collection_manager:
+            self.data_collection_manager.shutdown()
+        
         QApplication.instance().quit()
     
+    def showEvent(self, event):
+        """窗口显示事件"""
+        super().showEvent(event)
+        if self._refresh_stale:
+            self._refresh_stale = False
+            self.refresh_system_info()
+    
     def closeEvent(self, event):
         """窗口关闭事件"""
-        config = self.config_manager.get_section('gui')
+        config = self._gui_cfg
         if config and config.minimize_to_tray and self.tray_icon and self.tray_icon.isVisible():
             self.hide()
             event.ignore()
@@ -9,23 +9,27 @@ SysGraph 主应用程序入口
 import sys
 import asyncio
 import argparse
+import functools
 from pathlib import Path
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 
-from PyQt6.QtWidgets import QApplication
-from PyQt6.QtCore import QDir
 from loguru import logger
 
+if TYPE_CHECKING:
+    from PyQt6.QtWidgets import QApplication
+
 # 添加项目根目录到路径
 sys.path.insert(0, str(Path(__file__).parent))
 
-from gui import SysGraphMainWindow
 from core import DiagnosisManager, ConfigurationManager
 from utils import setup_logging, check_system_requirements
 
 
-def setup_application() -> QApplication:
+def setup_application() -> "QApplication":
     """设置Qt应用程序"""
+    # Qt仅在GUI模式下导入，CLI模式无需加载Qt共享库
+    from PyQt6.QtWidgets import QApplication
+    
     app = QApplication(sys.argv)
     app.setApplicationName("SysGraph")
     app.setApplicationVersion("0.1.0")
@@ -40,6 +44,9 @@ def setup_application() -> QApplication:
 
 def run_gui_mode() -> int:
     """运行GUI模式"""
+    from qasync import QEventLoop
+    from gui import SysGraphMainWindow
+    
     try:
         # 检查系统要求
         if not check_system_requirements():
@@ -48,6 +55,12 @@ def run_gui_mode() -> int:
             
         app = setup_application()
         
+        # 将asyncio事件循环与Qt事件循环合并
+        loop = QEventLoop(app)
+        asyncio.set_event_loop(loop)
+        app_close_event = asyncio.Event()
+        app.aboutToQuit.connect(app_close_event.set)
+        
         # 初始化配置管理器
         config_manager = ConfigurationManager()
         
@@ -56,7 +69,9 @@ def run_gui_mode() -> int:
         main_window.show()
         
         logger.info("SysGraph GUI已启动")
-        return app.exec()
+        with loop:
+            loop.run_until_complete(app_close_event.wait())
+        return 0
         
     except Exception as e:
         logger.error(f"启动GUI模式失败: {e}")
@@ -76,15 +91,17 @@ async def run_cli_mode(args: argparse.Namespace) -> int:
             
             # 执行诊断
             async for result in diagnosis_manager.run_diagnosis():
-                if result["type"] == "diagnosis_complete":
+                result_type = result["type"]
+                if result_type == "diagnosis_complete":
                     print(f"诊断完成: {result['summary']}")
-                    if result["issues"]:
-                        print("发现问题:")
-                        for issue in result["issues"]:
-                            print(f"  - {issue['description']} (严重程度: {issue['severity']})")
-                    else:
+                    issues = result["issues"]
+                    if not issues:
                         print("未发现系统问题")
-                elif result["type"] == "diagnosis_error":
+                        continue
+                    print("发现问题:")
+                    for issue in issues:
+                        print(f"  - {issue['description']} (严重程度: {issue['severity']})")
+                elif result_type == "diagnosis_error":
                     logger.error(f"诊断错误: {result['error']}")
                     return 1
                     
@@ -99,8 +116,9 @@ async def run_cli_mode(args: argparse.Namespace) -> int:
         return 1
 
 
+@functools.lru_cache(maxsize=1)
 def create_argument_parser() -> argparse.ArgumentParser:
-    """创建命令行参数解析器"""
+    """创建命令行参数解析器（进程内只构建一次，parse_args不修改解析器状态）"""
     parser = argparse.ArgumentParser(
         description="SysGraph - 智能系统诊断工具",
         epilog="使用示例: sysgraph --gui 或 sysgraph diagnose"
@@ -4,12 +4,20 @@
 定义系统数据的结构化表示。
 """
 
+from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Any, Union
 from datetime import datetime
-from pydantic import BaseModel, Field
+from functools import cached_property
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field
 
 
-class CPUInfo(BaseModel):
+class _FrozenModel(BaseModel):
+    """只读数据模型基类：采集后不再修改，忽略多余字段"""
+    model_config = ConfigDict(frozen=True, extra='ignore', validate_assignment=False)
+
+
+class CPUInfo(_FrozenModel):
     """CPU信息"""
     usage_percent: float = Field(description="CPU使用率")
     core_count: int = Field(description="CPU核心数")
@@ -18,7 +26,7 @@ class CPUInfo(BaseModel):
     load_average: Optional[List[float]] = Field(default=None, description="负载平均值")
 
 
-class MemoryInfo(BaseModel):
+class MemoryInfo(_FrozenModel):
     """内存信息"""
     total: int = Field(description="总内存(字节)")
     available: int = Field(description="可用内存(字节)")
@@ -28,7 +36,7 @@ class MemoryInfo(BaseModel):
     swap_used: int = Field(description="交换分区已用")
 
 
-class DiskInfo(BaseModel):
+class DiskInfo(_FrozenModel):
     """磁盘信息"""
     device: str = Field(description="设备名称")
     mountpoint: str = Field(description="挂载点")
@@ -39,7 +47,7 @@ class DiskInfo(BaseModel):
     usage_percent: float = Field(description="磁盘使用率")
 
 
-class NetworkInterface(BaseModel):
+class NetworkInterface(_FrozenModel):
     """网络接口信息"""
     name: str = Field(description="接口名称")
     ip_address: Optional[str] = Field(default=None, description="IP地址")
@@ -52,7 +60,7 @@ class NetworkInterface(BaseModel):
     packets_recv: int = Field(description="接收数据包数")
 
 
-class NetworkConnectivity(BaseModel):
+class NetworkConnectivity(_FrozenModel):
     """网络连通性"""
     host: str = Field(description="主机地址")
     is_reachable: bool = Field(description="是否可达")
@@ -60,7 +68,7 @@ class NetworkConnectivity(BaseModel):
     packet_loss: Optional[float] = Field(default=None, description="丢包率")
 
 
-class ProcessInfo(BaseModel):
+class ProcessInfo(_FrozenModel):
     """进程信息"""
     pid: int = Field(description="进程ID")
     name: str = Field(description="进程名称")
@@ -68,11 +76,72 @@ class ProcessInfo(BaseModel):
     memory_percent: float = Field(description="内存使用率")
     memory_rss: int = Field(description="物理内存(字节)")
     status: str = Field(description="进程状态")
-    create_time: datetime = Field(description="创建时间")
+    create_time: float = Field(description="创建时间(Unix时间戳)")
     command_line: Optional[str] = Field(default=None, description="命令行")
-
-
-class SystemInfo(BaseModel):
+    
+    @cached_property
+    def create_time_dt(self) -> datetime:
+        """创建时间的datetime形式，仅在展示时构建"""
+        return datetime.fromtimestamp(self.create_time)
+
+
+class ProcessTable(_FrozenModel):
+    """进程列存表 - 每个字段一个连续数组，便于向量化聚合"""
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+    
+    pids: np.ndarray = Field(description="进程ID数组")
+    names: List[str] = Field(description="进程名称列表")
+    cpu_percent: np.ndarray = Field(description="CPU使用率数组")
+    memory_percent: np.ndarray = Field(description="内存使用率数组")
+    memory_rss: np.ndarray = Field(description="物理内存数组(字节)")
+    statuses: np.ndarray = Field(description="进程状态数组")
+    create_times: np.ndarray = Field(description="创建时间数组(Unix时间戳)")
+    
+    @classmethod
+    def from_processes(cls, processes: List[ProcessInfo]) -> "ProcessTable":
+        """从进程列表构建列存表，数组按进程数预分配后逐行填充"""
+        count = len(processes)
+        pids = np.empty(count, dtype=np.int32)
+        cpu_percent = np.empty(count, dtype=np.float32)
+        memory_percent = np.empty(count, dtype=np.float32)
+        memory_rss = np.empty(count, dtype=np.int64)
+        create_times = np.empty(count, dtype=np.float64)
+        names = [""] * count
+        statuses = [""] * count
+        
+        for i, proc in enumerate(processes):
+            pids[i] = proc.pid
+            cpu_percent[i] = proc.cpu_percent
+            memory_percent[i] = proc.memory_percent
+            memory_rss[i] = proc.memory_rss
+            create_times[i] = proc.create_time
+            names[i] = proc.name
+            statuses[i] = proc.status
+        
+        return cls(
+            pids=pids,
+            names=names,
+            cpu_percent=cpu_percent,
+            memory_percent=memory_percent,
+            memory_rss=memory_rss,
+            statuses=np.array(statuses, dtype=str),
+            create_times=create_times,
+        )
+    
+    def __len__(self) -> int:
+        return len(self.pids)
+    
+    def top_indices(self, column: np.ndarray, count: int) -> np.ndarray:
+        """按指定列降序返回前count行的下标"""
+        if count <= 0:
+            return np.empty(0, dtype=np.intp)
+        if count >= len(column):
+            return np.argsort(column)[::-1]
+        top = np.argpartition(column, -count)[-count:]
+        return top[np.argsort(column[top])[::-1]]
+
+
+class SystemInfo(_FrozenModel):
     """系统基本信息"""
     hostname: str = Field(description="主机名")
     platform: str = Field(description="平台")
@@ -85,38 +154,63 @@ class SystemInfo(BaseModel):
     uptime: float = Field(description="运行时长(秒)")
 
 
-class HardwareData(BaseModel):
+class HardwareData(_FrozenModel):
     """硬件数据"""
     cpu: CPUInfo = Field(description="CPU信息")
     memory: MemoryInfo = Field(description="内存信息")
     disks: List[DiskInfo] = Field(description="磁盘信息列表")
     timestamp: datetime = Field(default_factory=datetime.now, description="采集时间")
+    
+    @cached_property
+    def disk_usage_percent(self) -> np.ndarray:
+        """各磁盘使用率数组，每个快照只构建一次"""
+        return np.fromiter((disk.usage_percent for disk in self.disks),
+                           dtype=np.float32, count=len(self.disks))
 
 
-class SystemData(BaseModel):
+class SystemData(_FrozenModel):
     """系统数据"""
     system_info: SystemInfo = Field(description="系统基本信息")
     processes: List[ProcessInfo] = Field(description="进程列表")
     timestamp: datetime = Field(default_factory=datetime.now, description="采集时间")
+    
+    @cached_property
+    def process_table(self) -> ProcessTable:
+        """进程列存视图，每个快照只构建一次"""
+        return ProcessTable.from_processes(self.processes)
 
 
-class NetworkData(BaseModel):
+class NetworkData(_FrozenModel):
     """网络数据"""
     interfaces: List[NetworkInterface] = Field(description="网络接口列表")
     connectivity: List[NetworkConnectivity] = Field(description="连通性测试结果")
     timestamp: datetime = Field(default_factory=datetime.now, description="采集时间")
 
 
-class SystemSnapshot(BaseModel):
-    """系统快照 - 完整的系统状态数据"""
-    hardware: HardwareData = Field(description="硬件数据")
-    system: SystemData = Field(description="系统数据")
-    network: NetworkData = Field(description="网络数据")
-    collection_id: str = Field(description="采集ID")
-    timestamp: datetime = Field(default_factory=datetime.now, description="采集时间")
-
-
-class DiagnosisIssue(BaseModel):
+@dataclass(frozen=True)
+class SystemSnapshot:
+    """系统快照 - 完整的系统状态数据
+    
+    各子数据在采集时已完成校验，快照本身只做组合，不再重复校验。
+    """
+    hardware: HardwareData  # 硬件数据
+    system: SystemData  # 系统数据
+    network: NetworkData  # 网络数据
+    collection_id: str  # 采集ID
+    timestamp: datetime = field(default_factory=datetime.now)  # 采集时间
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为普通字典"""
+        return {
+            "hardware": self.hardware.model_dump(),
+            "system": self.system.model_dump(),
+            "network": self.network.model_dump(),
+            "collection_id": self.collection_id,
+            "timestamp": self.timestamp,
+        }
+
+
+class DiagnosisIssue(_FrozenModel):
     """诊断问题"""
     issue_id: str = Field(description="问题ID")
     category: str = Field(description="问题类别")
@@ -129,7 +223,7 @@ class DiagnosisIssue(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.now, description="诊断时间")
 
 
-class DiagnosisResult(BaseModel):
+class DiagnosisResult(_FrozenModel):
     """诊断结果"""
     diagnosis_id: str = Field(description="诊断ID")
     system_snapshot: SystemSnapshot = Field(description="系统快照")
@@ -149,6 +243,7 @@ __all__ = [
     "NetworkInterface",
     "NetworkConnectivity",
     "ProcessInfo",
+    "ProcessTable",
     "SystemInfo",
     "HardwareData",
     "SystemData",
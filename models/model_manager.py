@@ -6,19 +6,41 @@
 
 import os
 import json
+import importlib.util
+from contextlib import contextmanager
+import copy
+import gc
+import hashlib
+import shutil
 import asyncio
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, Dict, Any, AsyncGenerator
 from datetime import datetime
 from loguru import logger
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# 安装了hf_transfer时启用多连接分片下载（需在导入huggingface_hub之前设置）
+if importlib.util.find_spec("hf_transfer") is not None:
+    os.environ.setdefault("HF_HUB_ENABLE_HF_TRANSFER", "1")
+
 try:
     import torch
     from transformers import (
         AutoTokenizer, 
         AutoModelForCausalLM, 
         GenerationConfig,
-        TextStreamer
+        TextStreamer,
+        DynamicCache,
+        StoppingCriteria,
+        StoppingCriteriaList
     )
     from huggingface_hub import hf_hub_download, HfFolder, snapshot_download
     HAS_TRANSFORMERS = True
@@ -29,9 +51,211 @@ except ImportError:
 from ..core.config_models import ModelConfiguration
 
 
+if HAS_TRANSFORMERS:
+    class _AsyncQueueStreamer(TextStreamer):
+        """把解码后的文本投递到asyncio队列的流式输出器，文本结束时投递None"""
+        
+        def __init__(self, tokenizer, loop: asyncio.AbstractEventLoop, text_queue: "asyncio.Queue[Optional[str]]"):
+            super().__init__(tokenizer, skip_prompt=True, skip_special_tokens=True)
+            self._loop = loop
+            self._text_queue = text_queue
+        
+        def on_finalized_text(self, text: str, stream_end: bool = False):
+            if text:
+                self._loop.call_soon_threadsafe(self._text_queue.put_nowait, text)
+            if stream_end:
+                self._loop.call_soon_threadsafe(self._text_queue.put_nowait, None)
+    
+    class _EventStoppingCriteria(StoppingCriteria):
+        """事件被设置时停止生成，读取端放弃流式输出后及时释放GPU"""
+        
+        def __init__(self, stop_event: threading.Event):
+            self._stop_event = stop_event
+        
+        def __call__(self, input_ids: "torch.Tensor", scores: "torch.Tensor", **kwargs) -> "torch.Tensor":
+            return torch.full((input_ids.shape[0],), self._stop_event.is_set(),
+                              dtype=torch.bool, device=input_ids.device)
+
+
+# 视为网络文件系统的挂载类型
+_NETWORK_FS_TYPES = ("nfs", "nfs4", "cifs", "smbfs", "smb3", "9p", "fuse.sshfs")
+
+# 内存文件系统，暂存到其上会与已加载的权重重复占用内存
+_MEMORY_FS_TYPES = ("tmpfs", "ramfs")
+
+# 网络挂载上的模型超过此大小时才复制到本地磁盘暂存目录
+STAGE_MIN_BYTES = 1 << 30
+# /var/tmp 按约定位于磁盘且跨重启保留，可通过环境变量指定其他本地目录
+STAGE_ROOT = Path(os.environ.get("SYSGRAPH_STAGE_DIR", "/var/tmp/sysgraph-models"))
+
+
+def _mount_fs_type(path: Path) -> Optional[str]:
+    """获取路径所在挂载点的文件系统类型（解析/proc/mounts，非Linux平台返回None）"""
+    try:
+        with open("/proc/mounts", "r", encoding="utf-8") as f:
+            mounts = [line.split()[1:3] for line in f if line.strip()]
+    except OSError:
+        return None
+    
+    # 取与路径匹配的最长挂载点
+    resolved = os.path.realpath(path)
+    best_point, best_type = "", None
+    for mount_point, fs_type in mounts:
+        mount_point = mount_point.replace("\\040", " ")
+        prefix = mount_point.rstrip("/") + "/"
+        if (resolved == mount_point or resolved.startswith(prefix)) and len(mount_point) > len(best_point):
+            best_point, best_type = mount_point, fs_type
+    return best_type
+
+
+def _is_network_fs(path: Path) -> bool:
+    """判断路径是否位于网络文件系统上"""
+    return _mount_fs_type(path) in _NETWORK_FS_TYPES
+
+
+def _pid_alive(pid: int) -> bool:
+    """判断进程是否仍在运行"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+def _evict_staged_copies(source_dir: Path, keep: str) -> None:
+    """
+    删除同一模型源的旧版本副本，以及已退出进程遗留的未完成副本
+    
+    其他模型源的副本可能正被其他管理器或进程使用，不在清理范围内。
+    """
+    try:
+        entries = list(os.scandir(source_dir))
+    except OSError:
+        return
+    
+    for entry in entries:
+        if entry.name == keep or not entry.is_dir(follow_symlinks=False):
+            continue
+        
+        # 未完成的副本以 .partial-<pid>-<线程号> 结尾，复制进程仍在运行时保留
+        version, sep, owner = entry.name.partition(".partial-")
+        if sep:
+            pid = owner.split("-", 1)[0]
+            if not pid.isdigit() or int(pid) == os.getpid() or _pid_alive(int(pid)):
+                continue
+        elif not version.isdigit() or not keep.isdigit() or int(version) >= int(keep):
+            continue
+        
+        logger.info(f"清理过期的模型暂存副本: {entry.path}")
+        shutil.rmtree(entry.path, ignore_errors=True)
+
+
+def _directory_size(path: Path) -> int:
+    """统计目录下文件总大小（跟随HF缓存中的符号链接）"""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.stat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+class _PrefixKVCache:
+    """
+    提示前缀KV缓存
+    
+    保存上一次提示的KV缓存，新提示与其存在按块对齐的公共前缀时，
+    返回裁剪到该前缀的缓存副本，生成时只需计算前缀之后的token。
+    """
+    
+    def __init__(self, block_size: int = 64, max_num_blocks: int = 128):
+        self.block_size = block_size
+        self.max_tokens = block_size * max_num_blocks
+        self._tokens = None  # 已缓存前缀的token序列
+        self._cache = None
+        self._lock = threading.Lock()
+    
+    def get(self, input_ids: "torch.Tensor"):
+        """获取与input_ids公共前缀对应的KV缓存副本，无可复用前缀时返回None"""
+        with self._lock:
+            if self._cache is None:
+                return None
+            
+            ids = input_ids[0]
+            # 至少保留最后一个token交给模型计算
+            length = min(len(self._tokens), len(ids) - 1)
+            if length < self.block_size:
+                return None
+            
+            mismatch = (self._tokens[:length] != ids[:length]).nonzero()
+            common = int(mismatch[0]) if len(mismatch) else length
+            common -= common % self.block_size
+            if common == 0:
+                return None
+            
+            # generate会扩展缓存，因此返回副本；只复制公共前缀部分的KV
+            layers = self._layer_key_values(self._cache)
+            if layers is None:
+                cache = copy.deepcopy(self._cache)
+                cache.crop(common)
+                return cache
+            
+            cache = DynamicCache()
+            for layer_idx, (key, value) in enumerate(layers):
+                cache.update(key[..., :common, :].clone(), value[..., :common, :].clone(), layer_idx)
+        
+        return cache
+    
+    @staticmethod
+    def _layer_key_values(cache):
+        """获取缓存各层的(key, value)张量，缓存结构无法识别时返回None"""
+        if hasattr(cache, "layers"):
+            # transformers 4.56+ 按层保存
+            if all(hasattr(layer, "keys") and hasattr(layer, "values") for layer in cache.layers):
+                return [(layer.keys, layer.values) for layer in cache.layers]
+            return None
+        if hasattr(cache, "key_cache") and hasattr(cache, "value_cache"):
+            return list(zip(cache.key_cache, cache.value_cache))
+        return None
+    
+    def update(self, input_ids: "torch.Tensor", past_key_values) -> None:
+        """用本次生成的KV缓存更新前缀缓存（只保留提示部分）"""
+        if past_key_values is None or not hasattr(past_key_values, "crop"):
+            return
+        
+        length = min(input_ids.shape[1], self.max_tokens)
+        length -= length % self.block_size
+        if length == 0:
+            return
+        
+        past_key_values.crop(length)
+        with self._lock:
+            self._tokens = input_ids[0, :length]
+            self._cache = past_key_values
+    
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._tokens = None
+            self._cache = None
+
+
 class ModelManager:
     """AI模型管理器"""
     
+    # 进程内共享的已加载模型，按加载参数索引；所有管理器都卸载后自动释放
+    _shared_models: "weakref.WeakValueDictionary[tuple, Any]" = weakref.WeakValueDictionary()
+    _shared_models_lock = threading.Lock()
+    
+    # 进程内共享的tokenizer，按模型路径索引，重新加载模型时不再解析词表
+    _tokenizer_cache: Dict[str, Any] = {}
+    
     def __init__(self, config: ModelConfiguration, cache_dir: Optional[str] = None):
         """
         初始化模型管理器
@@ -50,7 +274,13 @@ class ModelManager:
         self.device = None
         
         self._model_info = {}
+        self._info_mtime: Optional[float] = None  # 已解析的模型信息文件修改时间
         self._load_status = "unloaded"  # unloaded, loading, loaded, error
+        self._prefix_cache = _PrefixKVCache(block_size=64, max_num_blocks=128)
+        
+        # 下载使用I/O线程池；权重加载串行执行，避免与其他执行器任务争用
+        self._io_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="sysgraph-hf")
+        self._load_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sysgraph-model-load")
     
     def _get_device(self) -> str:
         """获取运行设备"""
@@ -67,6 +297,50 @@ class ModelManager:
         else:
             return self.config.device
     
+    def _pick_dtype(self) -> "torch.dtype":
+        """选择权重精度：支持BF16的GPU用BF16，其余GPU用FP16，CPU/MPS用FP32"""
+        if self.device != "cuda":
+            return torch.float32
+        
+        return torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+    
+    def _build_quantization_config(self) -> Optional[Any]:
+        """根据配置构建bitsandbytes量化配置，未启用或不可用时返回None"""
+        quantization = self.config.quantization
+        if not quantization:
+            return None
+        
+        if self.device != "cuda":
+            logger.warning(f"权重量化仅支持CUDA设备，当前设备 {self.device}，使用全精度加载")
+            return None
+        
+        if importlib.util.find_spec("bitsandbytes") is None:
+            logger.warning("bitsandbytes库未安装，使用全精度加载")
+            return None
+        
+        from transformers import BitsAndBytesConfig
+        
+        if quantization == "int8":
+            return BitsAndBytesConfig(load_in_8bit=True)
+        
+        return BitsAndBytesConfig(
+            load_in_4bit=True,
+            bnb_4bit_compute_dtype=self._pick_dtype(),
+            bnb_4bit_quant_type=quantization,  # nf4 / fp4
+            bnb_4bit_use_double_quant=True
+        )
+    
+    @contextmanager
+    def _inference_context(self):
+        """推理上下文：inference_mode，CUDA上按配置启用自动混合精度"""
+        use_amp = self.device == "cuda" and self.config.use_amp
+        with torch.inference_mode(), torch.autocast(
+            device_type="cuda" if use_amp else "cpu",
+            dtype=self._pick_dtype() if use_amp else torch.bfloat16,
+            enabled=use_amp
+        ):
+            yield
+    
     async def download_model(self, progress_callback: Optional[callable] = None) -> bool:
         """
         下载模型
@@ -96,12 +370,14 @@ class ModelManager:
             def download_snapshot():
                 return snapshot_download(
                     repo_id=self.config.model_name,
-                    cache_dir=str(model_cache_dir),
+                    cache_dir=os.environ.get("HUGGINGFACE_HUB_CACHE", str(model_cache_dir)),
                     resume_download=True,
-                    local_files_only=False
+                    local_files_only=False,
+                    max_workers=8,  # 并行下载多个权重分片
+                    etag_timeout=30
                 )
             
-            model_path = await loop.run_in_executor(None, download_snapshot)
+            model_path = await loop.run_in_executor(self._io_executor, download_snapshot)
             
             if progress_callback:
                 progress_callback({"status": "downloaded", "progress": 100, "message": "模型下载完成"})
@@ -129,11 +405,20 @@ class ModelManager:
                 "config": self.config.dict()
             }
             
+            if HAS_ORJSON:
+                data = orjson.dumps(model_info, option=orjson.OPT_INDENT_2)
+            else:
+                data = json.dumps(model_info, indent=2, ensure_ascii=False).encode('utf-8')
+            
+            # 先写临时文件再原子替换，进程中断时不会留下截断的信息文件
             info_file = self.cache_dir / "model_info.json"
-            with open(info_file, 'w', encoding='utf-8') as f:
-                json.dump(model_info, f, indent=2, ensure_ascii=False)
+            tmp_file = info_file.with_name(info_file.name + ".tmp")
+            with open(tmp_file, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_file, info_file)
                 
             self._model_info = model_info
+            self._info_mtime = info_file.stat().st_mtime
             
         except Exception as e:
             logger.warning(f"保存模型信息失败: {e}")
@@ -142,10 +427,20 @@ class ModelManager:
         """加载模型信息"""
         try:
             info_file = self.cache_dir / "model_info.json"
-            if info_file.exists():
-                with open(info_file, 'r', encoding='utf-8') as f:
-                    self._model_info = json.load(f)
+            try:
+                mtime = info_file.stat().st_mtime
+            except FileNotFoundError:
+                return False
+            
+            # 文件未变化时直接使用已解析的信息
+            if mtime == self._info_mtime and self._model_info:
                 return True
+            
+            with open(info_file, 'rb') as f:
+                data = f.read()
+            self._model_info = orjson.loads(data) if HAS_ORJSON else json.loads(data)
+            self._info_mtime = mtime
+            return True
         except Exception as e:
             logger.warning(f"加载模型信息失败: {e}")
         return False
@@ -209,39 +504,42 @@ class ModelManager:
             model_path = self._model_info.get("model_path") or self.config.model_name
             self.device = self._get_device()
             
+            # 网络挂载上的模型先复制到本地内存盘，避免每个分片都走网络读取
+            loop = asyncio.get_event_loop()
+            model_path = await loop.run_in_executor(
+                self._io_executor,
+                lambda: self._stage_local_copy(model_path)
+            )
+            
             if progress_callback:
                 progress_callback({"status": "loading", "progress": 25, "message": "加载tokenizer"})
             
             # 加载tokenizer
-            loop = asyncio.get_event_loop()
             self.tokenizer = await loop.run_in_executor(
-                None, 
-                lambda: AutoTokenizer.from_pretrained(
-                    model_path,
-                    trust_remote_code=True,
-                    cache_dir=str(self.cache_dir)
-                )
+                self._load_executor,
+                lambda: self._load_tokenizer(model_path)
             )
             
             if progress_callback:
                 progress_callback({"status": "loading", "progress": 60, "message": "加载模型"})
             
             # 加载模型
+            quantization_config = self._build_quantization_config()
+            if quantization_config is not None:
+                # 量化权重由bitsandbytes管理精度和设备放置
+                load_kwargs = {"quantization_config": quantization_config, "device_map": "auto"}
+            else:
+                # 非CUDA设备也通过device_map直接在目标设备上逐分片构建权重，避免先加载再整体复制
+                load_kwargs = {
+                    "torch_dtype": self._pick_dtype(),
+                    "device_map": "auto" if self.device == "cuda" else {"": self.device},
+                }
+            
             self.model = await loop.run_in_executor(
-                None,
-                lambda: AutoModelForCausalLM.from_pretrained(
-                    model_path,
-                    torch_dtype=torch.float16 if self.device == "cuda" else torch.float32,
-                    device_map="auto" if self.device == "cuda" else None,
-                    trust_remote_code=True,
-                    cache_dir=str(self.cache_dir)
-                )
+                self._load_executor,
+                lambda: self._load_shared_model(model_path, load_kwargs)
             )
             
-            # 移动模型到指定设备
-            if self.device != "cuda":  # cuda模式下device_map已处理
-                self.model = self.model.to(self.device)
-            
             if progress_callback:
                 progress_callback({"status": "loading", "progress": 80, "message": "配置生成参数"})
             
@@ -270,6 +568,124 @@ class ModelManager:
                 progress_callback({"status": "error", "progress": 0, "message": f"加载失败: {e}"})
             return False
     
+    @staticmethod
+    def _stage_local_copy(model_path: str) -> str:
+        """模型目录位于网络文件系统且体积较大时，复制到本地磁盘暂存目录并返回本地路径"""
+        source = Path(model_path)
+        if not source.is_dir() or not _is_network_fs(source):
+            return model_path
+        
+        # 暂存目录本身须位于本地磁盘：网络挂载没有收益，内存文件系统会使权重占用双份内存
+        stage_fs = _mount_fs_type(STAGE_ROOT)
+        if stage_fs is None or stage_fs in _NETWORK_FS_TYPES or stage_fs in _MEMORY_FS_TYPES:
+            logger.debug(f"暂存目录 {STAGE_ROOT} 不在本地磁盘上({stage_fs})，直接从网络挂载加载模型")
+            return model_path
+        
+        try:
+            # 副本按 <源路径哈希>/<config.json修改时间> 存放，源快照变化后生成新版本并清理旧版本
+            version = str((source / "config.json").stat().st_mtime_ns)
+        except OSError:
+            return model_path
+        source_dir = STAGE_ROOT / hashlib.sha1(str(source.resolve()).encode("utf-8")).hexdigest()[:16]
+        target = source_dir / version
+        
+        _evict_staged_copies(source_dir, keep=version)
+        if target.is_dir():
+            logger.info(f"复用本地模型副本: {target}")
+            return str(target)
+        
+        partial = source_dir / f"{version}.partial-{os.getpid()}-{threading.get_ident()}"
+        try:
+            size = _directory_size(source)
+            if size < STAGE_MIN_BYTES:
+                return model_path
+            
+            source_dir.mkdir(parents=True, exist_ok=True)
+            if shutil.disk_usage(source_dir).free < size + STAGE_MIN_BYTES:
+                logger.warning("本地暂存目录空间不足，直接从网络挂载加载模型")
+                return model_path
+            
+            logger.info(f"模型位于网络文件系统，复制到本地: {target}")
+            # 不保留符号链接，HF缓存的blob内容直接写入副本；复制完成后整体改名，
+            # 中断的复制不会被当作完整副本
+            shutil.copytree(source, partial)
+            try:
+                os.rename(partial, target)
+            except OSError:
+                # 其他进程已先完成同一副本
+                shutil.rmtree(partial, ignore_errors=True)
+                if not target.is_dir():
+                    raise
+            return str(target)
+        except (OSError, shutil.Error) as e:
+            logger.warning(f"复制模型到本地失败，直接从网络挂载加载: {e}")
+            shutil.rmtree(partial, ignore_errors=True)
+            return model_path
+    
+    def _load_tokenizer(self, model_path: str):
+        """加载tokenizer，优先使用Rust实现的fast tokenizer"""
+        cache_key = str(model_path)
+        tokenizer = self._tokenizer_cache.get(cache_key)
+        if tokenizer is None:
+            tokenizer = AutoTokenizer.from_pretrained(
+                model_path,
+                use_fast=True,
+                trust_remote_code=True,
+                cache_dir=str(self.cache_dir)
+            )
+            self._tokenizer_cache[cache_key] = tokenizer
+        return tokenizer
+    
+    def _load_shared_model(self, model_path: str, load_kwargs: Dict[str, Any]):
+        """加载模型权重，同一进程内相同参数的模型只反序列化一次"""
+        use_compile = self.config.use_compile and self.device == "cuda"
+        key = (str(model_path), self.device, self.config.quantization, str(load_kwargs.get("torch_dtype")), use_compile)
+        
+        with self._shared_models_lock:
+            model = self._shared_models.get(key)
+            if model is not None:
+                logger.info("复用进程内已加载的模型权重")
+                return model
+            
+            # safetensors权重直接映射加载，不先构建随机初始化的模型
+            model = AutoModelForCausalLM.from_pretrained(
+                model_path,
+                trust_remote_code=True,
+                cache_dir=str(self.cache_dir),
+                low_cpu_mem_usage=True,
+                **load_kwargs
+            )
+            
+            if use_compile:
+                self._compile_model(model)
+            
+            self._shared_models[key] = model
+            return model
+    
+    def _compile_model(self, model) -> None:
+        """编译模型前向计算并预热，使首个请求到达前完成图捕获"""
+        if not hasattr(torch, "compile"):
+            logger.warning("当前torch版本不支持torch.compile，跳过模型编译")
+            return
+        
+        original_forward = model.forward
+        try:
+            # generate内部调用的是模块的forward，因此编译forward而非包装整个模块。
+            # DynamicCache（前缀KV缓存复用也依赖它）的长度每步增长，按动态形状编译，
+            # 避免每个新长度触发重新编译；CUDA Graph要求静态形状，因此不用reduce-overhead
+            model.forward = torch.compile(original_forward, dynamic=True)
+            
+            # 预热使用多token提示并生成多步，覆盖预填充和逐步解码两种形状，
+            # 长度取大于1的值，避免序列维被特化为常量
+            dummy_input = torch.zeros((1, 8), dtype=torch.long, device=model.device)
+            with self._inference_context():
+                model.generate(dummy_input, max_new_tokens=8, do_sample=False)
+            
+            logger.info("模型编译完成")
+        except Exception as e:
+            logger.warning(f"模型编译失败，使用未编译模型: {e}")
+            model.forward = original_forward
+    
     def unload_model(self) -> None:
         """卸载模型"""
         try:
@@ -282,10 +698,14 @@ class ModelManager:
                 self.tokenizer = None
             
             self.generation_config = None
+            self._prefix_cache.clear()
             
-            # 清理GPU内存
+            # 回收循环引用中残留的张量（两轮以覆盖分代晋升的对象），再释放GPU缓存
+            gc.collect()
+            gc.collect()
             if HAS_TRANSFORMERS and torch.cuda.is_available():
                 torch.cuda.empty_cache()
+                torch.cuda.ipc_collect()
             
             self._load_status = "unloaded"
             logger.info("模型已卸载")
@@ -308,8 +728,12 @@ class ModelManager:
             raise RuntimeError("模型未加载")
         
         try:
-            # 编码输入
-            inputs = self.tokenizer.encode(prompt, return_tensors="pt").to(self.device)
+            # 编码输入；CUDA上经锁页内存异步拷贝，后续kernel在同一stream上自然排序
+            inputs = self.tokenizer.encode(prompt, return_tensors="pt")
+            if self.device == "cuda":
+                inputs = inputs.pin_memory().to(self.device, non_blocking=True)
+            else:
+                inputs = inputs.to(self.device)
             
             if stream:
                 # 流式生成
@@ -320,14 +744,17 @@ class ModelManager:
                 loop = asyncio.get_event_loop()
                 
                 def generate():
-                    with torch.no_grad():
+                    # 与上一次提示共享前缀时复用其KV缓存
+                    prefix_kv = self._prefix_cache.get(inputs)
+                    with self._inference_context():
                         outputs = self.model.generate(
                             inputs,
                             generation_config=self.generation_config,
-                            do_sample=True,
-                            return_dict_in_generate=True,
-                            output_scores=True
+                            past_key_values=prefix_kv,
+                            use_cache=True,
+                            return_dict_in_generate=True  # 仅用于取回KV缓存供前缀复用
                         )
+                    self._prefix_cache.update(inputs, getattr(outputs, "past_key_values", None))
                     
                     # 解码输出
                     generated_text = self.tokenizer.decode(
@@ -344,58 +771,55 @@ class ModelManager:
             logger.error(f"文本生成失败: {e}")
             yield f"生成失败: {e}"
     
-    async def _generate_stream(self, inputs: torch.Tensor, original_prompt: str) -> AsyncGenerator[str, None]:
+    async def _generate_stream(self, inputs: "torch.Tensor", original_prompt: str) -> AsyncGenerator[str, None]:
         """流式生成文本"""
         try:
-            generated_tokens = []
-            
-            with torch.no_grad():
-                past_key_values = None
-                
-                for _ in range(self.config.max_tokens):
-                    # 生成下一个token
-                    if past_key_values is None:
-                        outputs = self.model(inputs)
-                    else:
-                        outputs = self.model(inputs[:, -1:], past_key_values=past_key_values)
-                    
-                    past_key_values = outputs.past_key_values
-                    
-                    # 应用生成配置
-                    logits = outputs.logits[0, -1, :] / self.config.temperature
-                    
-                    # Top-p采样
-                    sorted_logits, sorted_indices = torch.sort(logits, descending=True)
-                    cumulative_probs = torch.cumsum(torch.softmax(sorted_logits, dim=-1), dim=-1)
-                    
-                    # 找到cutoff位置
-                    cutoff_index = torch.searchsorted(cumulative_probs, self.config.top_p)
-                    cutoff_index = max(1, cutoff_index.item())
-                    
-                    # 保留top-p的tokens
-                    top_p_logits = sorted_logits[:cutoff_index]
-                    top_p_indices = sorted_indices[:cutoff_index]
-                    
-                    # 采样
-                    probs = torch.softmax(top_p_logits, dim=-1)
-                    next_token_idx = torch.multinomial(probs, 1)
-                    next_token = top_p_indices[next_token_idx]
-                    
-                    # 检查是否为结束token
-                    if next_token.item() == self.tokenizer.eos_token_id:
-                        break
-                    
-                    generated_tokens.append(next_token.item())
-                    
-                    # 解码并输出新token
-                    new_text = self.tokenizer.decode([next_token.item()], skip_special_tokens=True)
-                    yield new_text
+            # 采样与KV缓存由transformers的generate完成，生成在后台线程中运行，
+            # 解码出的文本直接投递到事件循环的队列中，不经过执行器中转
+            loop = asyncio.get_event_loop()
+            text_queue: "asyncio.Queue[Any]" = asyncio.Queue()
+            streamer = _AsyncQueueStreamer(self.tokenizer, loop, text_queue)
+            stop_event = threading.Event()
+            
+            def generate():
+                try:
+                    with self._inference_context():
+                        self.model.generate(
+                            inputs,
+                            generation_config=self.generation_config,
+                            streamer=streamer,
+                            stopping_criteria=StoppingCriteriaList([_EventStoppingCriteria(stop_event)])
+                        )
+                except Exception as e:
+                    # 异常经队列交给读取端抛出，同时结束文本流
+                    loop.call_soon_threadsafe(text_queue.put_nowait, e)
+            
+            thread = threading.Thread(target=generate, name="sysgraph-generate", daemon=True)
+            thread.start()
+            
+            try:
+                # 每次唤醒后把队列中已就绪的文本一并取出，合并为一次输出
+                finished = False
+                while not finished:
+                    pending = [await text_queue.get()]
+                    while not text_queue.empty():
+                        pending.append(text_queue.get_nowait())
                     
-                    # 准备下一次迭代的输入
-                    inputs = torch.cat([inputs, next_token.unsqueeze(0)], dim=1)
+                    texts, error = [], None
+                    for item in pending:
+                        if item is None or isinstance(item, Exception):
+                            finished, error = True, item
+                            break
+                        texts.append(item)
                     
-                    # 添加小延迟以实现流式效果
-                    await asyncio.sleep(0.01)
+                    chunk = "".join(texts)
+                    if chunk:
+                        yield chunk
+                    if error is not None:
+                        raise error
+            finally:
+                # 正常结束、出错或读取端停止迭代时都通知生成线程停止
+                stop_event.set()
                     
         except Exception as e:
             logger.error(f"流式生成失败: {e}")
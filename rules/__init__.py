@@ -7,17 +7,263 @@
 import json
 import yaml
 import asyncio
+import itertools
+import operator
+import os
 import subprocess
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, Iterator, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
+import numpy as np
 from loguru import logger
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
 
 from ..models import SystemSnapshot, DiagnosisIssue
 from ..core.config_models import RuleEngineConfiguration
 
 
+def _get_nested_value(data: Any, keys: Tuple[str, ...]) -> Any:
+    """按预先拆分的键路径获取嵌套字段值"""
+    # 每层只做一次字典查找，缺失或为None时立即结束
+    current = data
+    for key in keys:
+        if not isinstance(current, dict):
+            return None
+        current = current.get(key)
+        if current is None:
+            return None
+    return current
+
+
+def _to_float_array(values: List[Any]) -> np.ndarray:
+    """把字段值列表转换为float数组，None和非数值元素记为NaN"""
+    try:
+        return np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        return np.fromiter(
+            (v if isinstance(v, (int, float)) else np.nan for v in values),
+            dtype=np.float64, count=len(values)
+        )
+
+
+# 优先使用libyaml的C实现，未安装时回退到纯Python实现
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# 达到此大小的JSON规则文件逐条流式解析，小文件整体解析更快
+_STREAM_PARSE_MIN_BYTES = 64 * 1024
+
+# 远程规则文件扩展名
+_RULE_FILE_SUFFIXES = frozenset({'.json', '.yaml', '.yml'})
+
+
+def _find_rule_files(root: Path) -> List[Path]:
+    """一次遍历目录树查找规则文件，跳过git元数据目录"""
+    rule_files = []
+    pending = [str(root)]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name != '.git':
+                            pending.append(entry.path)
+                    elif os.path.splitext(entry.name)[1].lower() in _RULE_FILE_SUFFIXES and entry.is_file():
+                        rule_files.append(Path(entry.path))
+        except OSError as e:
+            logger.warning(f"扫描规则目录失败: {e}")
+    return rule_files
+
+
+def _iter_json_rule_items(f) -> Iterator[Dict[str, Any]]:
+    """流式迭代JSON规则文件中的规则对象，支持顶层数组和 {"rules": [...]} 两种格式"""
+    head = f.read(64).lstrip()
+    f.seek(0)
+    prefix = 'item' if head.startswith(b'[') else 'rules.item'
+    return ijson.items(f, prefix, use_float=True)
+
+
+# 证据中列表值最多展示的元素个数
+_EVIDENCE_MAX_ITEMS = 5
+
+
+def _summarize_value(value: Any) -> Any:
+    """截断过长的列表值，避免为证据生成大字符串"""
+    if isinstance(value, list) and len(value) > _EVIDENCE_MAX_ITEMS:
+        return f"{value[:_EVIDENCE_MAX_ITEMS]}...(共{len(value)}项)"
+    return value
+
+
+def _never_matches(field_value: Any) -> bool:
+    """无法编译的条件始终不匹配"""
+    return False
+
+
+def _numeric_builder(compare: Callable[[Any, Any], Any]) -> Callable[[Any, Optional[str]], Callable[[Any], bool]]:
+    """数值比较的判定函数构建器，字段值和目标值先转换为float再比较"""
+    def build(target: Any, field_check: Optional[str]) -> Callable[[Any], bool]:
+        bound = float(target)
+        
+        def numeric_compare(v):
+            # 通配符字段取出的是列表，任一元素满足即匹配
+            if isinstance(v, list):
+                return bool(compare(_to_float_array(v), bound).any())
+            return compare(float(v), bound)
+        return numeric_compare
+    return build
+
+
+def _build_avg_gt(target: Any, field_check: Optional[str]) -> Callable[[Any], bool]:
+    def avg_gt(v):
+        if not isinstance(v, list):
+            logger.warning("未知操作符: avg>")
+            return False
+        values = _to_float_array(v)
+        values = values[np.isfinite(values)]
+        return values.size > 0 and float(values.mean()) > target
+    return avg_gt
+
+
+def _build_all_false(target: Any, field_check: Optional[str]) -> Optional[Callable[[Any], bool]]:
+    if not field_check:
+        return None
+    return lambda v: isinstance(v, list) and all(not item.get(field_check, True) for item in v)
+
+
+def _build_none_true(target: Any, field_check: Optional[str]) -> Optional[Callable[[Any], bool]]:
+    if not field_check:
+        return None
+    return lambda v: isinstance(v, list) and not any(item.get(field_check, False) for item in v)
+
+
+# 操作符到判定函数构建器的映射，构建器以 (目标值, field_check) 返回判定函数，
+# 参数不完整时返回None
+_OPERATOR_BUILDERS: Dict[str, Callable[[Any, Optional[str]], Optional[Callable[[Any], bool]]]] = {
+    '>': _numeric_builder(operator.gt),
+    '<': _numeric_builder(operator.lt),
+    '>=': _numeric_builder(operator.ge),
+    '<=': _numeric_builder(operator.le),
+    '==': lambda target, field_check: (lambda v: v == target),
+    '!=': lambda target, field_check: (lambda v: v != target),
+    'contains': lambda target, field_check: (lambda v: target in str(v)),
+    'count': lambda target, field_check: (lambda v: isinstance(v, list) and len(v) > target),
+    'all_false': _build_all_false,
+    'none_true': _build_none_true,
+    'avg>': _build_avg_gt,
+}
+
+
+class _CompiledCondition:
+    """
+    预编译的规则条件
+    
+    字段路径在加载时拆分为键元组，操作符解析为判定函数，
+    执行规则时只需按元组取值并调用判定函数。
+    """
+    
+    __slots__ = ("field", "operator", "value", "field_check", "head", "wildcard", "tail", "resolve", "_test")
+    
+    def __init__(self, condition: Dict[str, Any]):
+        self.field: str = condition.get('field', '')
+        self.operator: str = condition.get('operator', '==')
+        self.value: Any = condition.get('value')
+        self.field_check: Optional[str] = condition.get('field_check')
+        
+        # 拆分字段路径，"[*]" 通配符把路径分为列表路径和元素内路径
+        if '[*]' in self.field:
+            base_path, array_field = self.field.split('[*]', 1)
+            if array_field.startswith('.'):
+                array_field = array_field[1:]
+            self.wildcard = True
+            self.head = tuple(base_path.split('.'))
+            self.tail = tuple(array_field.split('.')) if array_field else ()
+            self.resolve: Callable[[Dict[str, Any]], Any] = self._resolve_wildcard
+        else:
+            # 简单点分路径：直接按键元组取值，不经过通配符处理
+            self.wildcard = False
+            self.head = tuple(self.field.split('.'))
+            self.tail = ()
+            self.resolve = self._resolve_simple
+        
+        try:
+            self._test = self._build_test()
+        except (TypeError, ValueError) as e:
+            logger.warning(f"条件编译失败 {self.field}: {e}")
+            self._test = _never_matches
+    
+    def _build_test(self) -> Callable[[Any], bool]:
+        """按操作符表构建判定函数"""
+        builder = _OPERATOR_BUILDERS.get(self.operator)
+        test = builder(self.value, self.field_check) if builder else None
+        if test is None:
+            logger.warning(f"未知操作符: {self.operator}")
+            return _never_matches
+        return test
+    
+    def cost(self) -> int:
+        """估计判定开销：标量比较最低，列表计数次之，逐元素的列表运算最高"""
+        if self.wildcard or self.operator == 'avg>':
+            return 2
+        if self.operator in ('count', 'all_false', 'none_true'):
+            return 1
+        return 0
+    
+    def _resolve_simple(self, data: Dict[str, Any]) -> Any:
+        """取出简单点分路径字段的值"""
+        return _get_nested_value(data, self.head)
+    
+    def _resolve_wildcard(self, data: Dict[str, Any]) -> Any:
+        """取出通配符路径字段的值列表"""
+        value = _get_nested_value(data, self.head)
+        if not isinstance(value, list):
+            return []
+        if not self.tail:
+            return value
+        return [_get_nested_value(item, self.tail) for item in value if isinstance(item, dict)]
+    
+    def test(self, field_value: Any) -> bool:
+        """判定字段值是否满足条件"""
+        try:
+            return self._test(field_value)
+        except Exception as e:
+            logger.warning(f"条件评估失败: {e}")
+            return False
+    
+    def check(self, data: Dict[str, Any], field_values: Dict[str, Any], full_value: bool = False) -> Tuple[bool, str]:
+        """
+        检查条件，返回是否匹配及证据描述
+        
+        field_values 是本次快照已取出的字段值表，按字段路径共享，
+        表中没有的字段在此取值后写回。full_value 为False时证据中的长列表被截断。
+        """
+        try:
+            if self.field in field_values:
+                field_value = field_values[self.field]
+            else:
+                field_value = field_values[self.field] = self.resolve(data)
+            matched = self.test(field_value)
+        except Exception as e:
+            return False, f"{self.field}: 条件检查失败 - {e}"
+        
+        if matched:
+            return True, f"{self.field} {self.operator} {self.value}: 匹配"
+        shown = field_value if full_value else _summarize_value(field_value)
+        return False, f"{self.field} {self.operator} {self.value}: 不匹配 (实际值: {shown})"
+
+
 class Rule(BaseModel):
     """规则定义"""
     rule_id: str = Field(description="规则ID")
@@ -33,18 +279,46 @@ class Rule(BaseModel):
     author: str = Field(default="system", description="规则作者")
     created_at: datetime = Field(default_factory=datetime.now, description="创建时间")
     updated_at: datetime = Field(default_factory=datetime.now, description="更新时间")
+    
+    _compiled: Optional[List[_CompiledCondition]] = PrivateAttr(default=None)
+    
+    def get_compiled_conditions(self) -> List[_CompiledCondition]:
+        """获取预编译的条件列表，首次调用时编译"""
+        if self._compiled is None:
+            compiled = [_CompiledCondition(condition) for condition in self.conditions]
+            # 开销小的条件排在前面，不满足时尽早结束检查
+            compiled.sort(key=_CompiledCondition.cost)
+            self._compiled = compiled
+        return self._compiled
 
 
-class RuleExecutionResult(BaseModel):
-    """规则执行结果"""
-    rule_id: str = Field(description="规则ID")
-    matched: bool = Field(description="是否匹配")
-    confidence: float = Field(description="执行置信度")
-    evidence: List[str] = Field(description="匹配证据")
-    actions_taken: List[str] = Field(description="执行的动作")
-    issues_found: List[DiagnosisIssue] = Field(description="发现的问题")
-    execution_time: float = Field(description="执行时间")
-    timestamp: datetime = Field(default_factory=datetime.now, description="执行时间")
+@dataclass
+class RuleExecutionResult:
+    """规则执行结果
+    
+    只由规则引擎内部构造，字段均已是合法数据，不再经过校验。
+    """
+    rule_id: str  # 规则ID
+    matched: bool  # 是否匹配
+    confidence: float  # 执行置信度
+    evidence: List[str]  # 匹配证据
+    actions_taken: List[str]  # 执行的动作
+    issues_found: List[DiagnosisIssue]  # 发现的问题
+    execution_time: float  # 执行时间
+    timestamp: datetime = field(default_factory=datetime.now)  # 执行时间
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为普通字典"""
+        return {
+            "rule_id": self.rule_id,
+            "matched": self.matched,
+            "confidence": self.confidence,
+            "evidence": list(self.evidence),
+            "actions_taken": list(self.actions_taken),
+            "issues_found": [issue.model_dump() for issue in self.issues_found],
+            "execution_time": self.execution_time,
+            "timestamp": self.timestamp,
+        }
 
 
 class BuiltinRules:
@@ -226,22 +500,68 @@ class RuleEngine:
         
         self._last_remote_update: Optional[datetime] = None
         
+        # 启用规则及其类别索引，只在规则加载后重建
+        self._enabled_rules: Tuple[Rule, ...] = ()
+        self._rules_by_category: Dict[str, Tuple[Rule, ...]] = {}
+        
+        # 问题ID序号，与批次时间戳组合保证唯一
+        self._issue_seq = itertools.count(1)
+        
+        # 远程规则加载任务，首次需要时在事件循环中创建
+        self._remote_load_task: Optional["asyncio.Future[None]"] = None
+        
         # 加载内置规则
         if config.enable_builtin_rules:
             self._load_builtin_rules()
-        
-        # 加载远程规则
-        if config.enable_remote_rules:
-            asyncio.create_task(self._load_remote_rules())
+    
+    async def initialize(self) -> None:
+        """加载远程规则，应在事件循环启动后调用；未调用时首次执行规则前自动加载"""
+        if self.config.enable_remote_rules:
+            await self._ensure_remote_rules_loaded()
+    
+    async def _ensure_remote_rules_loaded(self) -> None:
+        """等待远程规则加载完成，多个调用方共用同一个加载任务"""
+        if self._remote_load_task is None:
+            self._remote_load_task = asyncio.ensure_future(self._load_remote_rules())
+        # 调用方被取消时不影响共享的加载任务
+        await asyncio.shield(self._remote_load_task)
     
     def _load_builtin_rules(self) -> None:
         """加载内置规则"""
         try:
             self.builtin_rules = BuiltinRules.get_all_builtin_rules()
+            self._compile_rules(self.builtin_rules)
+            self._rebuild_rule_indexes()
             logger.info(f"加载了 {len(self.builtin_rules)} 个内置规则")
         except Exception as e:
             logger.error(f"加载内置规则失败: {e}")
     
+    def _compile_rules(self, rules: List[Rule]) -> None:
+        """在加载时预编译规则条件"""
+        for rule in rules:
+            rule.get_compiled_conditions()
+    
+    def _rebuild_rule_indexes(self) -> None:
+        """
+        重建启用规则和类别索引
+        
+        同一规则ID只保留最后加载的定义，远程规则覆盖同ID的内置规则。
+        """
+        rules_by_id: Dict[str, Rule] = {}
+        if self.config.enable_builtin_rules:
+            rules_by_id.update((rule.rule_id, rule) for rule in self.builtin_rules)
+        if self.config.enable_remote_rules:
+            rules_by_id.update((rule.rule_id, rule) for rule in self.remote_rules)
+        
+        enabled_rules = tuple(rule for rule in rules_by_id.values() if rule.enabled)
+        
+        by_category: Dict[str, List[Rule]] = {}
+        for rule in enabled_rules:
+            by_category.setdefault(rule.category, []).append(rule)
+        
+        self._enabled_rules = enabled_rules
+        self._rules_by_category = {category: tuple(rules) for category, rules in by_category.items()}
+    
     async def _load_remote_rules(self) -> None:
         """加载远程规则"""
         try:
@@ -303,54 +623,64 @@ class RuleEngine:
                 return
             
             # 查找规则文件
-            rule_files = []
-            for pattern in ["*.json", "*.yaml", "*.yml"]:
-                rule_files.extend(repo_dir.rglob(pattern))
+            rule_files = _find_rule_files(repo_dir)
             
-            remote_rules = []
-            for rule_file in rule_files:
-                try:
-                    with open(rule_file, 'r', encoding='utf-8') as f:
-                        if rule_file.suffix.lower() == '.json':
-                            data = json.load(f)
-                        else:
-                            data = yaml.safe_load(f)
-                    
-                    # 解析规则数据
-                    if isinstance(data, list):
-                        for rule_data in data:
-                            rule = Rule(**rule_data)
-                            remote_rules.append(rule)
-                    elif isinstance(data, dict) and 'rules' in data:
-                        for rule_data in data['rules']:
-                            rule = Rule(**rule_data)
-                            remote_rules.append(rule)
-                    
-                except Exception as e:
-                    logger.warning(f"解析规则文件失败 {rule_file}: {e}")
+            # 各文件在线程中并行解析，不阻塞事件循环
+            parsed = await asyncio.gather(*(asyncio.to_thread(self._parse_rule_file, f) for f in rule_files))
+            remote_rules = [rule for rules in parsed for rule in rules]
             
+            self._compile_rules(remote_rules)
             self.remote_rules = remote_rules
+            self._rebuild_rule_indexes()
             logger.info(f"加载了 {len(remote_rules)} 个远程规则")
             
         except Exception as e:
             logger.error(f"加载缓存远程规则失败: {e}")
     
-    def get_all_rules(self) -> List[Rule]:
-        """获取所有规则"""
-        all_rules = []
-        
-        if self.config.enable_builtin_rules:
-            all_rules.extend(self.builtin_rules)
-        
-        if self.config.enable_remote_rules:
-            all_rules.extend(self.remote_rules)
+    @staticmethod
+    def _parse_rule_file(rule_file: Path) -> List[Rule]:
+        """解析单个规则文件，解析失败时保留已解析的规则"""
+        rules = []
+        try:
+            is_json = rule_file.suffix.lower() == '.json'
+            if is_json and HAS_IJSON and os.path.getsize(rule_file) >= _STREAM_PARSE_MIN_BYTES:
+                # 大文件逐条构建规则，不先生成整个文档
+                with open(rule_file, 'rb') as f:
+                    for rule_data in _iter_json_rule_items(f):
+                        rules.append(Rule(**rule_data))
+                data = None
+            else:
+                # 一次读入原始字节，由解析器自行解码
+                with open(rule_file, 'rb') as f:
+                    raw = f.read()
+                if is_json:
+                    data = orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+                else:
+                    data = yaml.load(raw, Loader=_YAML_LOADER)
+            
+            # 解析规则数据
+            if isinstance(data, list):
+                for rule_data in data:
+                    rules.append(Rule(**rule_data))
+            elif isinstance(data, dict) and 'rules' in data:
+                for rule_data in data['rules']:
+                    rules.append(Rule(**rule_data))
+            
+        except Exception as e:
+            logger.warning(f"解析规则文件失败 {rule_file}: {e}")
         
-        # 过滤启用的规则
-        return [rule for rule in all_rules if rule.enabled]
+        # 在工作线程中一并完成条件编译
+        for rule in rules:
+            rule.get_compiled_conditions()
+        return rules
+    
+    def get_all_rules(self) -> Tuple[Rule, ...]:
+        """获取所有启用的规则"""
+        return self._enabled_rules
     
-    def get_rules_by_category(self, category: str) -> List[Rule]:
+    def get_rules_by_category(self, category: str) -> Tuple[Rule, ...]:
         """根据类别获取规则"""
-        return [rule for rule in self.get_all_rules() if rule.category == category]
+        return self._rules_by_category.get(category, ())
     
     async def execute_rules(self, snapshot: SystemSnapshot) -> List[RuleExecutionResult]:
         """
@@ -365,28 +695,24 @@ class RuleEngine:
         try:
             logger.info("开始执行规则检查")
             
+            if self.config.enable_remote_rules:
+                await self._ensure_remote_rules_loaded()
+            
             rules = self.get_all_rules()
-            execution_results = []
             
-            for rule in rules:
-                start_time = datetime.now()
-                try:
-                    result = await self._execute_single_rule(rule, snapshot)
-                    execution_time = (datetime.now() - start_time).total_seconds()
-                    result.execution_time = execution_time
-                    execution_results.append(result)
-                    
-                except Exception as e:
-                    logger.error(f"规则执行失败 {rule.rule_id}: {e}")
-                    execution_results.append(RuleExecutionResult(
-                        rule_id=rule.rule_id,
-                        matched=False,
-                        confidence=0.0,
-                        evidence=[],
-                        actions_taken=[],
-                        issues_found=[],
-                        execution_time=(datetime.now() - start_time).total_seconds()
-                    ))
+            # 快照只转换一次字典；字段值在条件检查时按需取出并缓存，所有规则共用，
+            # 短路未检查到的字段不会取值
+            snapshot_dict = snapshot.to_dict()
+            field_values: Dict[str, Any] = {}
+            
+            # 同一批次的结果共用一个时间戳
+            batch_time = datetime.now()
+            
+            # 规则之间互不依赖，并发执行
+            execution_results = list(await asyncio.gather(
+                *(self._execute_single_rule_timed(rule, snapshot, snapshot_dict, field_values, batch_time)
+                  for rule in rules)
+            ))
             
             logger.info(f"规则检查完成，执行了 {len(execution_results)} 个规则")
             return execution_results
@@ -395,11 +721,34 @@ class RuleEngine:
             logger.error(f"规则执行异常: {e}")
             return []
     
-    async def _execute_single_rule(self, rule: Rule, snapshot: SystemSnapshot) -> RuleExecutionResult:
+    async def _execute_single_rule_timed(self, rule: Rule, snapshot: SystemSnapshot, snapshot_dict: Dict[str, Any],
+                                         field_values: Dict[str, Any], batch_time: datetime) -> RuleExecutionResult:
+        """执行单个规则并记录耗时，执行失败时返回未匹配结果"""
+        start = time.perf_counter()
+        try:
+            result = await self._execute_single_rule(rule, snapshot, snapshot_dict, field_values, batch_time)
+            result.execution_time = time.perf_counter() - start
+            return result
+            
+        except Exception as e:
+            logger.error(f"规则执行失败 {rule.rule_id}: {e}")
+            return RuleExecutionResult(
+                rule_id=rule.rule_id,
+                matched=False,
+                confidence=0.0,
+                evidence=[],
+                actions_taken=[],
+                issues_found=[],
+                execution_time=time.perf_counter() - start,
+                timestamp=batch_time
+            )
+    
+    async def _execute_single_rule(self, rule: Rule, snapshot: SystemSnapshot, snapshot_dict: Dict[str, Any],
+                                   field_values: Dict[str, Any], batch_time: datetime) -> RuleExecutionResult:
         """执行单个规则"""
         try:
             # 检查条件
-            matched, evidence = self._check_conditions(rule.conditions, snapshot)
+            matched, evidence = self._check_conditions(rule.get_compiled_conditions(), snapshot_dict, field_values)
             
             # 如果条件匹配，执行动作
             actions_taken = []
@@ -407,7 +756,7 @@ class RuleEngine:
             
             if matched:
                 for action in rule.actions:
-                    action_result = await self._execute_action(action, rule, snapshot, evidence)
+                    action_result = await self._execute_action(action, rule, snapshot, evidence, batch_time)
                     actions_taken.append(action_result.get('description', ''))
                     
                     if action_result.get('issue'):
@@ -425,142 +774,47 @@ class RuleEngine:
                 evidence=evidence,
                 actions_taken=actions_taken,
                 issues_found=issues_found,
-                execution_time=0.0  # 将在调用方设置
+                execution_time=0.0,  # 将在调用方设置
+                timestamp=batch_time
             )
             
         except Exception as e:
             logger.error(f"执行规则失败 {rule.rule_id}: {e}")
             raise
     
-    def _check_conditions(self, conditions: List[Dict[str, Any]], snapshot: SystemSnapshot) -> tuple[bool, List[str]]:
+    def _check_conditions(self, conditions: List[_CompiledCondition], snapshot_dict: Dict[str, Any],
+                          field_values: Dict[str, Any]) -> Tuple[bool, List[str]]:
         """检查条件是否满足"""
         evidence = []
         all_matched = True
         
-        snapshot_dict = snapshot.dict()
-        
         for condition in conditions:
-            field = condition.get('field', '')
-            operator = condition.get('operator', '==')
-            value = condition.get('value')
-            field_check = condition.get('field_check')
-            
-            try:
-                field_value = self._get_field_value(snapshot_dict, field)
-                matched = self._evaluate_condition(field_value, operator, value, field_check)
-                
-                if matched:
-                    evidence.append(f"{field} {operator} {value}: 匹配")
-                else:
-                    all_matched = False
-                    evidence.append(f"{field} {operator} {value}: 不匹配 (实际值: {field_value})")
-                    
-            except Exception as e:
+            matched, description = condition.check(snapshot_dict, field_values, self.config.debug)
+            evidence.append(description)
+            if not matched:
                 all_matched = False
-                evidence.append(f"{field}: 条件检查失败 - {e}")
+                # 结果已确定，调试模式下才继续收集其余条件的证据
+                if not self.config.debug:
+                    break
         
         return all_matched, evidence
     
-    def _get_field_value(self, data: Dict[str, Any], field_path: str) -> Any:
-        """从数据中获取字段值"""
-        try:
-            # 处理数组索引和通配符
-            if '[*]' in field_path:
-                # 处理数组通配符
-                base_path, array_field = field_path.split('[*]', 1)
-                base_value = self._get_nested_value(data, base_path)
-                
-                if isinstance(base_value, list):
-                    if array_field.startswith('.'):
-                        array_field = array_field[1:]  # 移除开头的点
-                    
-                    if array_field:
-                        return [self._get_nested_value(item, array_field) for item in base_value if isinstance(item, dict)]
-                    else:
-                        return base_value
-                else:
-                    return []
-            else:
-                return self._get_nested_value(data, field_path)
-                
-        except Exception as e:
-            logger.warning(f"获取字段值失败 {field_path}: {e}")
-            return None
-    
-    def _get_nested_value(self, data: Dict[str, Any], path: str) -> Any:
-        """获取嵌套字段值"""
-        keys = path.split('.')
-        current = data
-        
-        for key in keys:
-            if isinstance(current, dict) and key in current:
-                current = current[key]
-            else:
-                return None
-        
-        return current
-    
-    def _evaluate_condition(self, field_value: Any, operator: str, target_value: Any, field_check: Optional[str] = None) -> bool:
-        """评估条件"""
-        try:
-            if operator == '>':
-                return float(field_value) > float(target_value)
-            elif operator == '<':
-                return float(field_value) < float(target_value)
-            elif operator == '>=':
-                return float(field_value) >= float(target_value)
-            elif operator == '<=':
-                return float(field_value) <= float(target_value)
-            elif operator == '==':
-                return field_value == target_value
-            elif operator == '!=':
-                return field_value != target_value
-            elif operator == 'contains':
-                return target_value in str(field_value)
-            elif operator == 'count':
-                if isinstance(field_value, list):
-                    return len(field_value) > target_value
-                else:
-                    return False
-            elif operator == 'all_false' and field_check:
-                if isinstance(field_value, list):
-                    return all(not item.get(field_check, True) for item in field_value)
-                else:
-                    return False
-            elif operator == 'none_true' and field_check:
-                if isinstance(field_value, list):
-                    return not any(item.get(field_check, False) for item in field_value)
-                else:
-                    return False
-            elif operator == 'avg>' and isinstance(field_value, list):
-                numeric_values = [v for v in field_value if isinstance(v, (int, float)) and v is not None]
-                if numeric_values:
-                    avg_value = sum(numeric_values) / len(numeric_values)
-                    return avg_value > target_value
-                else:
-                    return False
-            else:
-                logger.warning(f"未知操作符: {operator}")
-                return False
-                
-        except Exception as e:
-            logger.warning(f"条件评估失败: {e}")
-            return False
-    
-    async def _execute_action(self, action: Dict[str, Any], rule: Rule, snapshot: SystemSnapshot, evidence: List[str]) -> Dict[str, Any]:
+    async def _execute_action(self, action: Dict[str, Any], rule: Rule, snapshot: SystemSnapshot, evidence: List[str],
+                              batch_time: datetime) -> Dict[str, Any]:
         """执行动作"""
         action_type = action.get('type', '')
         
         if action_type == 'create_issue':
             issue = DiagnosisIssue(
-                issue_id=f"{rule.rule_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+                issue_id=f"{rule.rule_id}_{int(batch_time.timestamp())}_{next(self._issue_seq)}",
                 category=rule.category,
                 severity=action.get('severity', rule.severity),
                 title=rule.name,
                 description=action.get('message', rule.description),
                 recommendation=action.get('recommendation', f"请检查{rule.category}相关配置"),
                 confidence=rule.confidence,
-                evidence=evidence
+                evidence=evidence,
+                timestamp=batch_time
             )
             
             return {
@@ -0,0 +1,71 @@
+"""模型本地暂存测试"""
+
+import os
+
+import pytest
+
+from sysgraph.models import model_manager
+from sysgraph.models.model_manager import ModelManager
+
+
+@pytest.fixture
+def staging(tmp_path, monkeypatch):
+    """将tmp_path/remote视为网络挂载，暂存目录位于tmp_path/stage"""
+    remote = tmp_path / "remote"
+    remote.mkdir()
+    stage_root = tmp_path / "stage"
+    
+    def fake_fs_type(path):
+        return "nfs" if str(path).startswith(str(remote)) else "ext4"
+    
+    monkeypatch.setattr(model_manager, "_mount_fs_type", fake_fs_type)
+    monkeypatch.setattr(model_manager, "STAGE_ROOT", stage_root)
+    monkeypatch.setattr(model_manager, "STAGE_MIN_BYTES", 0)
+    return remote, stage_root
+
+
+def _make_model(directory, name):
+    model_dir = directory / name
+    model_dir.mkdir()
+    (model_dir / "config.json").write_text("{}", encoding="utf-8")
+    (model_dir / "model.safetensors").write_bytes(b"\0" * 16)
+    return model_dir
+
+
+def test_staging_second_source_keeps_first_copy(staging):
+    remote, stage_root = staging
+    first = ModelManager._stage_local_copy(str(_make_model(remote, "a")))
+    second = ModelManager._stage_local_copy(str(_make_model(remote, "b")))
+    
+    assert first != second
+    assert os.path.isfile(os.path.join(first, "model.safetensors"))
+    assert os.path.isfile(os.path.join(second, "model.safetensors"))
+    assert not any(".partial-" in p.name for p in stage_root.rglob("*"))
+
+
+def test_staging_evicts_older_version_of_same_source(staging):
+    remote, _ = staging
+    source = _make_model(remote, "a")
+    old = ModelManager._stage_local_copy(str(source))
+    
+    config = source / "config.json"
+    stat = config.stat()
+    os.utime(config, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    new = ModelManager._stage_local_copy(str(source))
+    
+    assert new != old
+    assert os.path.isdir(new)
+    assert not os.path.exists(old)
+
+
+def test_staging_keeps_partial_copy_of_current_process(staging):
+    remote, stage_root = staging
+    source = _make_model(remote, "a")
+    staged = ModelManager._stage_local_copy(str(source))
+    
+    source_dir = os.path.dirname(staged)
+    partial = os.path.join(source_dir, f"1.partial-{os.getpid()}-1")
+    os.mkdir(partial)
+    ModelManager._stage_local_copy(str(source))
+    
+    assert os.path.isdir(partial)
@@ -5,7 +5,10 @@ SysGraph 工具函数模块
 """
 
 import sys
+import math
 import platform
+import functools
+from bisect import bisect_right
 from pathlib import Path
 from typing import Optional
 from loguru import logger
@@ -105,6 +108,13 @@ def get_system_info() -> dict:
     Returns:
         dict: 系统信息字典
     """
+    # 进程内系统信息不变，只查询一次，返回副本避免调用方修改缓存
+    return dict(_system_info())
+
+
+@functools.lru_cache(maxsize=1)
+def _system_info() -> dict:
+    """查询系统信息（结果缓存）"""
     return {
         "platform": platform.platform(),
         "system": platform.system(),
@@ -135,6 +145,14 @@ def ensure_directory(path: Path) -> bool:
         return False
 
 
+# 字节单位，第i级对应 1024**i
+_BYTE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+# 时长单位切换阈值(秒)及各区间的 (除数, 单位)
+_DURATION_THRESHOLDS = (60, 3600, 86400)
+_DURATION_UNITS = ((1, "秒"), (60, "分钟"), (3600, "小时"), (86400, "天"))
+
+
 def format_bytes(bytes_value: int) -> str:
     """
     格式化字节数
@@ -145,11 +163,14 @@ def format_bytes(bytes_value: int) -> str:
     Returns:
         str: 格式化后的字符串
     """
-    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-        if bytes_value < 1024.0:
-            return f"{bytes_value:.1f}{unit}"
-        bytes_value /= 1024.0
-    return f"{bytes_value:.1f}PB"
+    # NaN/inf 无法取位数：负无穷落到最小单位，NaN和正无穷落到最大单位
+    if not math.isfinite(bytes_value):
+        unit = _BYTE_UNITS[0] if bytes_value < 0 else _BYTE_UNITS[-1]
+        return f"{bytes_value:.1f}{unit}"
+    
+    # 按二进制位数直接确定单位，每级单位相差10位
+    unit_index = min((max(int(bytes_value), 1).bit_length() - 1) // 10, len(_BYTE_UNITS) - 1)
+    return f"{bytes_value / (1 << (unit_index * 10)):.1f}{_BYTE_UNITS[unit_index]}"
 
 
 def format_duration(seconds: float) -> str:
@@ -162,14 +183,5 @@ def format_duration(seconds: float) -> str:
     Returns:
         str: 格式化后的时间字符串
     """
-    if seconds < 60:
-        return f"{seconds:.1f}秒"
-    elif seconds < 3600:
-        minutes = seconds / 60
-        return f"{minutes:.1f}分钟"
-    elif seconds < 86400:
-        hours = seconds / 3600
-        return f"{hours:.1f}小时"
-    else:
-        days = seconds / 86400
-        return f"{days:.1f}天"
\ No newline at end of file
+    divisor, unit = _DURATION_UNITS[bisect_right(_DURATION_THRESHOLDS, seconds)]
+    return f"{seconds / divisor:.1f}{unit}"
\ No newline at end of file